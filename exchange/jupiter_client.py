@@ -1,13 +1,25 @@
 """Jupiter aggregator API client for Solana token swaps."""
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from typing import Optional, Dict, Any, Tuple
 import httpx
 from loguru import logger
 
+from utils.coalesce import Coalescer
+
+# How long a fetched USD price is reused before asking Jupiter again.
+_PRICE_TTL_SECONDS = 3.0
+
 
 class JupiterClient:
     """Client for Jupiter swap aggregator API."""
 
-    def __init__(self, api_url: str = "https://quote-api.jup.ag/v6", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_url: str = "https://quote-api.jup.ag/v6",
+        api_key: Optional[str] = None,
+        max_concurrency: int = 8,
+    ):
         self.api_url = api_url.rstrip("/")
         self.api_key = api_key
 
@@ -16,7 +28,17 @@ class JupiterClient:
         if api_key:
             headers["x-api-key"] = api_key
 
-        self.client = httpx.AsyncClient(timeout=30.0, headers=headers)
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            headers=headers,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        # Caps in-flight API requests so bursts queue here instead of hitting rate limits
+        self._request_limit = asyncio.Semaphore(max_concurrency)
+
+        # mint -> (price, monotonic fetch time); concurrent identical fetches share one request
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._price_flights = Coalescer()
 
     async def close(self):
         """Close the HTTP client."""
@@ -49,16 +71,17 @@ class JupiterClient:
                 "slippageBps": str(slippage_bps),
             }
 
-            response = await self.client.get(f"{self.api_url}/quote", params=params)
+            async with self._request_limit:
+                response = await self.client.get(f"{self.api_url}/quote", params=params)
             response.raise_for_status()
 
             quote = response.json()
             logger.info(
-                "Jupiter quote: {} {} → {} {} (price impact: {}%)",
+                "Jupiter quote: {} {:.8} → {} {:.8} (price impact: {}%)",
                 amount,
-                input_mint[:8],
+                input_mint,
                 quote.get("outAmount", "?"),
-                output_mint[:8],
+                output_mint,
                 quote.get("priceImpactPct", 0),
             )
             return quote
@@ -108,10 +131,11 @@ class JupiterClient:
                     }
                 }
 
-            response = await self.client.post(
-                f"{self.api_url}/swap",
-                json=payload,
-            )
+            async with self._request_limit:
+                response = await self.client.post(
+                    f"{self.api_url}/swap",
+                    json=payload,
+                )
             response.raise_for_status()
 
             swap_data = response.json()
@@ -159,16 +183,38 @@ class JupiterClient:
             logger.warning("Jupiter API key not configured, skipping price fetch")
             return None
 
+        now = time.monotonic()
+        prices: Dict[str, float] = {}
+        missing = []
+        for mint in token_ids:
+            cached = self._price_cache.get(mint)
+            if cached is not None and now - cached[1] < _PRICE_TTL_SECONDS:
+                prices[mint] = cached[0]
+            else:
+                missing.append(mint)
+        if not missing:
+            return prices
+
+        key = frozenset(missing)
+        fetched = await self._price_flights.run(key, lambda: self._fetch_token_prices(sorted(key)))
+        if fetched is None:
+            return None
+        prices.update(fetched)
+        return prices
+
+    async def _fetch_token_prices(self, token_ids: list[str]) -> Optional[Dict[str, float]]:
+        """Fetch prices from the Price API and refresh the cache; None if the request failed."""
         try:
             params = {
                 "ids": ",".join(token_ids),
             }
 
             # Use V3 API endpoint (requires API key)
-            response = await self.client.get(
-                "https://api.jup.ag/price/v3",
-                params=params
-            )
+            async with self._request_limit:
+                response = await self.client.get(
+                    "https://api.jup.ag/price/v3",
+                    params=params
+                )
             response.raise_for_status()
 
             data = response.json()
@@ -182,6 +228,10 @@ class JupiterClient:
                     if price_val is not None:
                         prices[mint] = float(price_val)
 
+            fetched_at = time.monotonic()
+            for mint, price in prices.items():
+                self._price_cache[mint] = (price, fetched_at)
+
             logger.debug("Fetched prices for {} tokens", len(prices))
             return prices
 
@@ -1,24 +1,55 @@
 """Solana RPC client wrapper."""
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
 import base64
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solana.rpc.websocket_api import connect as ws_connect
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.transaction import VersionedTransaction
 from solders import message
 from solders.signature import Signature
+from solders.transaction_status import TransactionConfirmationStatus
+from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID
 from loguru import logger
 
+# SPL token account layout: mint (32) | owner (32) | amount (u64 LE) | ...
+_TOKEN_AMOUNT_OFFSET = 64
+_TOKEN_AMOUNT_END = _TOKEN_AMOUNT_OFFSET + 8
+
+# Roughly how long a transaction's blockhash stays valid.
+_CONFIRM_TIMEOUT_SECONDS = 60.0
+
+
+def _ws_url_for(rpc_url: str) -> str:
+    """Derive the RPC websocket endpoint from its HTTP URL."""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
 
 class SolanaClient:
     """Wrapper for Solana RPC client."""
 
-    def __init__(self, rpc_url: str, commitment: str = "confirmed"):
+    def __init__(
+        self,
+        rpc_url: str,
+        commitment: str = "confirmed",
+        ws_url: Optional[str] = None,
+        max_concurrency: int = 8,
+    ):
         self.rpc_url = rpc_url
+        self.ws_url = ws_url or _ws_url_for(rpc_url)
         self.commitment = commitment
         self.client = AsyncClient(rpc_url, commitment=Confirmed)
+        # Caps in-flight RPC requests so bursts queue here instead of hitting rate limits
+        self._rpc_limit = asyncio.Semaphore(max_concurrency)
         self._mint_info_cache: Dict[str, Dict[str, Any]] = {}
+        # (owner, mint) -> associated token account
+        self._ata_cache: Dict[Tuple[Pubkey, Pubkey], Pubkey] = {}
 
     async def close(self):
         """Close the RPC client."""
@@ -35,7 +66,8 @@ class SolanaClient:
             Balance in lamports or None if failed
         """
         try:
-            response = await self.client.get_balance(pubkey)
+            async with self._rpc_limit:
+                response = await self.client.get_balance(pubkey)
             if response.value is not None:
                 return response.value
             return None
@@ -70,17 +102,19 @@ class SolanaClient:
                 opts = TokenAccountOpts(mint=mint, program_id=program_id)
             else:
                 opts = TokenAccountOpts(mint=mint)
-            response = await self.client.get_token_accounts_by_owner(
-                owner,
-                opts
-            )
+            async with self._rpc_limit:
+                response = await self.client.get_token_accounts_by_owner(
+                    owner,
+                    opts
+                )
 
             if not response.value or len(response.value) == 0:
                 return 0
 
             # Get balance from first token account
             token_account = response.value[0].pubkey
-            balance_response = await self.client.get_token_account_balance(token_account)
+            async with self._rpc_limit:
+                balance_response = await self.client.get_token_account_balance(token_account)
 
             if balance_response.value:
                 return int(balance_response.value.amount)
@@ -95,6 +129,69 @@ class SolanaClient:
                         traceback.format_exc())
             return None
 
+    async def get_associated_token_address(self, owner: Pubkey, mint: Pubkey) -> Optional[Pubkey]:
+        """
+        Derive (and cache) the owner's associated token account for a mint.
+
+        Returns:
+            The ATA, or None if the mint's token program (Token vs Token-2022)
+            could not be resolved; guessing would point at the wrong account
+        """
+        key = (owner, mint)
+        ata = self._ata_cache.get(key)
+        if ata is not None:
+            return ata
+
+        program_id = await self.get_token_program_id(mint)
+        if program_id is None:
+            return None
+        ata, _ = Pubkey.find_program_address(
+            [bytes(owner), bytes(program_id), bytes(mint)],
+            ASSOCIATED_TOKEN_PROGRAM_ID,
+        )
+        self._ata_cache[key] = ata
+        return ata
+
+    async def get_multiple_balances(
+        self,
+        owner: Pubkey,
+        mints: List[Pubkey],
+    ) -> Optional[Tuple[int, List[int]]]:
+        """
+        Get SOL and token balances for a wallet in one getMultipleAccounts call.
+
+        Token balances are read from each mint's associated token account;
+        a missing account counts as zero, an unresolvable mint fails the lookup.
+
+        Args:
+            owner: Wallet public key
+            mints: Token mint addresses
+
+        Returns:
+            (lamports, token base units in mint order) or None if failed
+        """
+        try:
+            atas = [await self.get_associated_token_address(owner, mint) for mint in mints]
+            if any(ata is None for ata in atas):
+                # An unknown token program would make a real balance read as zero.
+                logger.error("Failed to get balances: could not resolve a mint's token program")
+                return None
+            async with self._rpc_limit:
+                response = await self.client.get_multiple_accounts([owner, *atas])
+            accounts = response.value
+
+            wallet = accounts[0]
+            amounts: List[int] = []
+            for account in accounts[1:]:
+                amount = 0
+                if account is not None and len(account.data) >= _TOKEN_AMOUNT_END:
+                    amount = int.from_bytes(account.data[_TOKEN_AMOUNT_OFFSET:_TOKEN_AMOUNT_END], "little")
+                amounts.append(amount)
+            return (wallet.lamports if wallet else 0), amounts
+        except Exception as e:
+            logger.error("Failed to get balances: {}", e)
+            return None
+
     async def get_mint_info(self, mint: Pubkey) -> Optional[Dict[str, Any]]:
         """Get mint owner program id and decimals (cached)."""
         mint_str = str(mint)
@@ -106,7 +203,8 @@ class SolanaClient:
         decimals: Optional[int] = None
 
         try:
-            account_info = await self.client.get_account_info(mint)
+            async with self._rpc_limit:
+                account_info = await self.client.get_account_info(mint)
             if account_info.value and account_info.value.owner:
                 owner_val = account_info.value.owner
                 owner = owner_val if isinstance(owner_val, Pubkey) else Pubkey.from_string(str(owner_val))
@@ -114,7 +212,8 @@ class SolanaClient:
             logger.error("Failed to get mint owner: {}", e)
 
         try:
-            supply = await self.client.get_token_supply(mint)
+            async with self._rpc_limit:
+                supply = await self.client.get_token_supply(mint)
             if supply.value and supply.value.decimals is not None:
                 decimals = int(supply.value.decimals)
         except Exception as e:
@@ -165,7 +264,8 @@ class SolanaClient:
             signed_tx = VersionedTransaction(message, [keypair])
 
             # Send transaction
-            response = await self.client.send_transaction(signed_tx)
+            async with self._rpc_limit:
+                response = await self.client.send_transaction(signed_tx)
 
             if response.value:
                 signature = str(response.value)
@@ -186,6 +286,9 @@ class SolanaClient:
         """
         Wait for transaction confirmation.
 
+        Waits on a websocket signatureSubscribe notification and falls back
+        to polling signature statuses if the websocket is unavailable.
+
         Args:
             signature: Transaction signature
             max_retries: Maximum confirmation attempts
@@ -195,6 +298,67 @@ class SolanaClient:
         """
         try:
             sig = Signature.from_string(signature)
+        except Exception as e:
+            logger.error("Failed to confirm transaction: {}", e)
+            return False
+
+        try:
+            confirmed = await asyncio.wait_for(
+                self._confirm_via_websocket(sig),
+                _CONFIRM_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            # One last status check before giving up.
+            try:
+                confirmed = bool(await self._signature_status(sig))
+            except Exception as e:
+                logger.error("Failed to confirm transaction: {}", e)
+                confirmed = False
+        except Exception as e:
+            logger.warning("Websocket confirmation unavailable ({}); polling instead", e)
+            return await self._confirm_by_polling(sig, signature)
+
+        if confirmed:
+            logger.info("Transaction confirmed: {}", signature)
+        return confirmed
+
+    async def _confirm_via_websocket(self, sig: Signature) -> bool:
+        """Wait for a signatureSubscribe notification at confirmed commitment."""
+        async with ws_connect(self.ws_url) as ws:
+            await ws.signature_subscribe(sig, commitment=Confirmed)
+            await ws.recv()  # subscription acknowledgement
+
+            # The transaction may have landed before the subscription existed.
+            status = await self._signature_status(sig)
+            if status is not None:
+                return status
+
+            while True:
+                for message in await ws.recv():
+                    value = getattr(getattr(message, "result", None), "value", None)
+                    if value is not None and hasattr(value, "err"):
+                        if value.err is not None:
+                            logger.warning("Transaction {} failed: {}", sig, value.err)
+                        return value.err is None
+
+    async def _signature_status(self, sig: Signature) -> Optional[bool]:
+        """Return True/False once a signature is confirmed/failed, None while pending."""
+        async with self._rpc_limit:
+            response = await self.client.get_signature_statuses([sig])
+        status = response.value[0] if response.value else None
+        if status is None:
+            return None
+        if status.err is not None:
+            return False
+        if status.confirmation_status in (
+            TransactionConfirmationStatus.Confirmed,
+            TransactionConfirmationStatus.Finalized,
+        ):
+            return True
+        return None
+
+    async def _confirm_by_polling(self, sig: Signature, signature: str) -> bool:
+        try:
             response = await self.client.confirm_transaction(
                 sig,
                 commitment=Confirmed,
@@ -214,7 +378,8 @@ class SolanaClient:
         """Fetch the transaction fee (lamports) for a confirmed signature."""
         try:
             sig = Signature.from_string(signature)
-            response = await self.client.get_transaction(sig, max_supported_transaction_version=0)
+            async with self._rpc_limit:
+                response = await self.client.get_transaction(sig, max_supported_transaction_version=0)
             if response and response.value and response.value.transaction:
                 meta = response.value.transaction.meta
                 if meta:
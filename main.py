@@ -3,20 +3,44 @@ import asyncio
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from contextlib import asynccontextmanager
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from loguru import logger
 
 from config import load_config
 from utils.logging import setup_logging
 from webhooks.tradingview import router as webhook_router
-from services.dashboard_router import router as dashboard_router
+from services.dashboard_router import (
+    router as dashboard_router,
+    load_token_metadata_cache,
+    set_dashboard_services,
+)
 from services.analytics_store import AnalyticsStore
+from services.analytics_writer import AnalyticsWriter
 from services.signal_router import SignalRouter
 from services.account_manager import AccountManager
 from exchange.jupiter_client import JupiterClient
 from exchange.solana_client import SolanaClient
 
+# Dashboard totals are anchored to Newfoundland time.
+_NL_TZ = ZoneInfo("America/St_Johns")
+
+# The dashboard page is served precompressed and the SSE stream must not be
+# buffered by a compressor, so both bypass response compression.
+_GZIP_EXEMPT_PATHS = frozenset({"/", "/api/stream"})
+
+
+class _SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip responses except for paths in _GZIP_EXEMPT_PATHS."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in _GZIP_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 
 async def _price_poller(app: FastAPI) -> None:
     """Background task to record token prices for dashboard charts."""
@@ -101,6 +125,20 @@ async def lifespan(app: FastAPI):
     if removed:
         logger.info("Cleaned up {} old price records", removed)
 
+    # Restore token metadata fetched by previous runs
+    loaded = load_token_metadata_cache(app)
+    if loaded:
+        logger.info("Loaded {} cached token metadata entries", loaded)
+
+    # Shared HTTP client for dashboard lookups
+    app.state.http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+    # Start batched analytics writes
+    app.state.analytics_writer.start()
+
     # Start background price polling
     app.state.price_task = asyncio.create_task(_price_poller(app))
 
@@ -118,11 +156,22 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    # Finish background fee lookups; they write through the analytics writer
+    await app.state.account_manager.aclose()
+
+    # Flush queued analytics writes
+    await app.state.analytics_writer.close()
+
     # Close clients
     if hasattr(app.state, "jupiter"):
         await app.state.jupiter.close()
     if hasattr(app.state, "solana"):
         await app.state.solana.close()
+    if hasattr(app.state, "http_client"):
+        await app.state.http_client.aclose()
+
+    # Drain log records still queued for the sinks
+    await logger.complete()
 
 
 def create_app() -> FastAPI:
@@ -135,6 +184,7 @@ def create_app() -> FastAPI:
     setup_logging(
         log_dir=log_config.get("dir", "./logs"),
         level=log_config.get("level", "INFO"),
+        console_level=log_config.get("console_level"),
     )
 
     logger.info("Configuration loaded")
@@ -147,7 +197,8 @@ def create_app() -> FastAPI:
     jupiter_config = config.get("jupiter", {})
     jupiter = JupiterClient(
         api_url=jupiter_config.get("api_url", "https://quote-api.jup.ag/v6"),
-        api_key=jupiter_config.get("api_key")
+        api_key=jupiter_config.get("api_key"),
+        max_concurrency=int(jupiter_config.get("max_concurrency", 8)),
     )
     logger.info("Jupiter client initialized")
 
@@ -156,21 +207,28 @@ def create_app() -> FastAPI:
     solana = SolanaClient(
         rpc_url=solana_config.get("rpc_url", "https://api.mainnet-beta.solana.com"),
         commitment=solana_config.get("commitment", "confirmed"),
+        ws_url=solana_config.get("ws_url"),
+        max_concurrency=int(solana_config.get("max_concurrency", 8)),
     )
     logger.info("Solana RPC client initialized")
 
+    # Batch signal and swap writes off the request path (started in lifespan)
+    analytics_writer = AnalyticsWriter(analytics)
+
     # Initialize account manager
     account_manager = AccountManager(
         config=config,
         jupiter=jupiter,
         solana=solana,
         analytics=analytics,
+        writer=analytics_writer,
     )
 
     # Initialize signal router
     signal_router = SignalRouter(
         account_manager=account_manager,
         analytics=analytics,
+        writer=analytics_writer,
     )
 
     # Create FastAPI app
@@ -190,26 +248,33 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress JSON API responses (repeated mints and keys compress well)
+    app.add_middleware(_SelectiveGZipMiddleware, minimum_size=512)
+
     # Store state
     app.state.config = config
     app.state.analytics = analytics
+    app.state.analytics_writer = analytics_writer
     app.state.jupiter = jupiter
     app.state.solana = solana
     app.state.account_manager = account_manager
     app.state.signal_router = signal_router
 
+    # Dashboard dependencies return the instances built above
+    set_dashboard_services(analytics, account_manager)
+
     totals_start_cfg = config.get("dashboard", {}).get("totals_start")
     totals_start = None
     if totals_start_cfg:
         try:
             totals_start = datetime.fromisoformat(str(totals_start_cfg))
             if totals_start.tzinfo is None:
-                totals_start = totals_start.replace(tzinfo=ZoneInfo("America/St_Johns"))
+                totals_start = totals_start.replace(tzinfo=_NL_TZ)
         except Exception as exc:
             logger.warning("Invalid totals_start config '{}': {}", totals_start_cfg, exc)
 
     if totals_start is None:
-        totals_start = datetime(2026, 2, 1, 0, 0, tzinfo=ZoneInfo("America/St_Johns"))
+        totals_start = datetime(2026, 2, 1, 0, 0, tzinfo=_NL_TZ)
 
     app.state.totals_start = totals_start.astimezone(timezone.utc)
 
@@ -243,4 +308,5 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=4201,
         reload=True,
+        loop="uvloop",
     )
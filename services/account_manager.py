@@ -1,5 +1,6 @@
 """Manages multiple wallet accounts for swap execution."""
-from typing import Dict, Any
+import asyncio
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
@@ -11,6 +12,21 @@ from services.swap_manager import SwapManager
 from services.swap_engine import SwapEngine
 from solders.keypair import Keypair
 
+if TYPE_CHECKING:
+    from services.analytics_writer import AnalyticsWriter
+
+
+def _routed_symbol(strategy: Dict[str, Any]) -> str:
+    """Resolve the symbol signals are recorded and executed under for a strategy."""
+    token_pair = strategy.get("token_pair", "")
+    if token_pair:
+        return token_pair
+    quote_token = strategy.get("quote_token", "")
+    base_token = strategy.get("base_token", "")
+    if quote_token and base_token:
+        return f"{quote_token}-{base_token}"
+    return ""
+
 
 @dataclass
 class WalletAccount:
@@ -19,7 +35,10 @@ class WalletAccount:
     label: str
     enabled: bool
     keypair: Keypair
+    address: str
     strategy: Dict[str, Any]
+    # Symbol signals are rewritten to for this account ("" keeps the signal's own)
+    routed_symbol: str
     swap_manager: SwapManager
     swap_engine: SwapEngine
 
@@ -33,14 +52,19 @@ class AccountManager:
         jupiter: JupiterClient,
         solana: SolanaClient,
         analytics: AnalyticsStore,
+        writer: Optional["AnalyticsWriter"] = None,
     ):
         self.config = config
         self.jupiter = jupiter
         self.solana = solana
         self.analytics = analytics
+        self.writer = writer
         self.accounts: Dict[str, WalletAccount] = {}
+        self._enabled_accounts: Tuple[WalletAccount, ...] = ()
+        self._by_symbol: Dict[str, Tuple[WalletAccount, ...]] = {}
 
         self._build_accounts()
+        self._build_symbol_index()
 
     def _build_accounts(self) -> None:
         """Build wallet accounts from configuration."""
@@ -64,6 +88,8 @@ class AccountManager:
                 logger.error("Account {} has invalid private key, skipping", account_id)
                 continue
 
+            strategy = account_config.get("strategy", {})
+
             # Create swap manager
             swap_manager = SwapManager(
                 account_id=account_id,
@@ -74,13 +100,14 @@ class AccountManager:
                 analytics=self.analytics,
                 token_mints=token_mints,
                 config=self.config,
+                writer=self.writer,
             )
 
             # Create swap engine
             swap_engine = SwapEngine(
                 account_id=account_id,
                 account_label=account_config.get("label", account_id),
-                strategy=account_config.get("strategy", {}),
+                strategy=strategy,
                 analytics=self.analytics,
                 swap_manager=swap_manager,
                 solana_client=self.solana,
@@ -94,7 +121,9 @@ class AccountManager:
                 label=account_config.get("label", account_id),
                 enabled=account_config.get("enabled", True),
                 keypair=keypair,
-                strategy=account_config.get("strategy", {}),
+                address=str(keypair.pubkey()),
+                strategy=strategy,
+                routed_symbol=_routed_symbol(strategy),
                 swap_manager=swap_manager,
                 swap_engine=swap_engine,
             )
@@ -105,11 +134,64 @@ class AccountManager:
                 "Account '{}' [{}] initialized (address: {})",
                 account.label,
                 account.id,
-                str(keypair.pubkey())[:16] + "..."
+                account.address[:16] + "..."
             )
 
         logger.info("Initialized {} wallet account(s)", len(self.accounts))
 
+    def _build_symbol_index(self) -> None:
+        """Index enabled accounts by every symbol a signal may use to address them."""
+        self._enabled_accounts = tuple(
+            account for account in self.accounts.values() if account.enabled
+        )
+        index: Dict[str, List[WalletAccount]] = {}
+        for account in self._enabled_accounts:
+            strategy = account.strategy
+            keys = {
+                strategy.get("token_pair", ""),
+                strategy.get("quote_token", ""),
+                strategy.get("base_token", ""),
+            }
+            for key in keys:
+                if key:
+                    index.setdefault(key, []).append(account)
+        self._by_symbol = {key: tuple(accounts) for key, accounts in index.items()}
+
+    async def aclose(self) -> None:
+        """Let each account's swap manager finish its background work."""
+        await asyncio.gather(*(account.swap_manager.aclose() for account in self.accounts.values()))
+
     def get_account(self, account_id: str) -> WalletAccount | None:
         """Get account by ID."""
         return self.accounts.get(account_id)
+
+    def set_enabled(self, account_id: str, enabled: bool) -> bool:
+        """
+        Enable or disable an account for signal routing.
+
+        Args:
+            account_id: Account to update
+            enabled: New enabled state
+
+        Returns:
+            True if the account exists, False otherwise
+        """
+        account = self.accounts.get(account_id)
+        if account is None:
+            return False
+        if account.enabled != enabled:
+            account.enabled = enabled
+            self.invalidate_symbol_index()
+        return True
+
+    def enabled_accounts(self) -> Tuple[WalletAccount, ...]:
+        """Get all enabled accounts."""
+        return self._enabled_accounts
+
+    def invalidate_symbol_index(self) -> None:
+        """Rebuild the symbol index after accounts are added, removed, enabled or disabled."""
+        self._build_symbol_index()
+
+    def accounts_for_symbol(self, symbol: str) -> Tuple[WalletAccount, ...]:
+        """Get enabled accounts whose token pair, quote or base token equals symbol."""
+        return self._by_symbol.get(symbol, ())
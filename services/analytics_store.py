@@ -1,9 +1,12 @@
 """SQLite persistence for signals, swaps, and analytics."""
 import json
 import os
+import secrets
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 
 class AnalyticsStore:
@@ -11,16 +14,67 @@ class AnalyticsStore:
 
     def __init__(self, db_path: str = "./data/skr_swap.db"):
         self.db_path = db_path
+        # Per-topic write counters used for cheap change detection (ETags, SSE).
+        self._versions: Dict[str, int] = {"signals": 0, "swaps": 0, "prices": 0}
+        # The counters restart at 0 with the process; tags built from them include
+        # this id so a version seen before a restart never matches one after it.
+        self.instance_id = secrets.token_hex(4)
+        # Swap ids are handed out here so records can be written asynchronously.
+        self._swap_id_lock = threading.Lock()
+        self._last_swap_id: Optional[int] = None
+        # Per-thread open transaction (and topics it touched) while inside batch()
+        self._batch = threading.local()
         dir_name = os.path.dirname(os.path.abspath(self.db_path))
         if dir_name:
             os.makedirs(dir_name, exist_ok=True)
         self._init_db()
 
+    def get_version(self, topic: Optional[str] = None) -> int:
+        """Return a counter that increases whenever a topic (or any topic) changes.
+
+        Topics are "signals", "swaps" and "prices".
+        """
+        if topic is None:
+            return sum(self._versions.values())
+        return self._versions[topic]
+
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, timeout=5.0)
         conn.row_factory = sqlite3.Row
         return conn
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run the writes made inside the block (on this thread) in one transaction."""
+        touched: Set[str] = set()
+        with self._connect() as conn:
+            self._batch.conn = conn
+            self._batch.touched = touched
+            try:
+                yield
+            finally:
+                self._batch.conn = None
+                self._batch.touched = None
+        # Bump versions only once the rows are committed and visible to readers.
+        for topic in touched:
+            self._versions[topic] += 1
+
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        conn = getattr(self._batch, "conn", None)
+        if conn is not None:
+            yield conn  # committed when the enclosing batch() exits
+            return
+        with self._connect() as conn:
+            yield conn
+
+    def _bump(self, topic: str) -> None:
+        touched = getattr(self._batch, "touched", None)
+        if touched is not None:
+            touched.add(topic)
+        else:
+            self._versions[topic] += 1
+
     def _init_db(self) -> None:
         with self._connect() as conn:
             # Enable WAL mode for better concurrency
@@ -38,10 +92,25 @@ class AnalyticsStore:
                     price REAL,
                     note TEXT,
                     raw_payload TEXT,
-                    account_id TEXT
+                    account_id TEXT,
+                    signal_type TEXT,
+                    timeframe TEXT
                 )
             """)
 
+            # Denormalize signal_type/timeframe out of raw_payload (migration)
+            try:
+                conn.execute("ALTER TABLE signals ADD COLUMN signal_type TEXT")
+                conn.execute("ALTER TABLE signals ADD COLUMN timeframe TEXT")
+                conn.execute("""
+                    UPDATE signals
+                    SET signal_type = json_extract(raw_payload, '$.signal_type'),
+                        timeframe = json_extract(raw_payload, '$.timeframe')
+                    WHERE json_valid(raw_payload)
+                """)
+            except sqlite3.OperationalError:
+                pass  # Columns already exist
+
             # Swaps table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS swaps (
@@ -159,17 +228,70 @@ class AnalyticsStore:
     ) -> int:
         """Record a received signal."""
         received_at = datetime.now(timezone.utc).isoformat()
-        raw_payload = json.dumps(payload or {}, default=str)
+        payload = payload or {}
+        raw_payload = json.dumps(payload, default=str)
 
-        with self._connect() as conn:
+        with self._writing() as conn:
             cur = conn.execute(
                 """
-                INSERT INTO signals (received_at, action, symbol, amount, price, note, raw_payload, account_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO signals (received_at, action, symbol, amount, price, note, raw_payload,
+                                     account_id, signal_type, timeframe)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (received_at, action, symbol, amount, price, note, raw_payload, account_id,
+                 payload.get("signal_type"), payload.get("timeframe")),
+            )
+        self._bump("signals")
+        return cur.lastrowid
+
+    def record_signals(self, signals: List[Dict[str, Any]]) -> None:
+        """Record a batch of signals in one transaction.
+
+        Each item takes the record_signal keyword arguments plus an optional
+        received_at ISO timestamp (defaults to now).
+        """
+        if not signals:
+            return
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for signal in signals:
+            payload = signal.get("payload") or {}
+            rows.append((
+                signal.get("received_at") or now_iso,
+                signal["action"],
+                signal["symbol"],
+                signal.get("amount"),
+                signal.get("price"),
+                signal.get("note"),
+                json.dumps(payload, default=str),
+                signal.get("account_id"),
+                payload.get("signal_type"),
+                payload.get("timeframe"),
+            ))
+
+        with self._writing() as conn:
+            conn.executemany(
+                """
+                INSERT INTO signals (received_at, action, symbol, amount, price, note, raw_payload,
+                                     account_id, signal_type, timeframe)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (received_at, action, symbol, amount, price, note, raw_payload, account_id),
+                rows,
             )
-            return cur.lastrowid
+        self._bump("signals")
+
+    def reserve_swap_id(self) -> int:
+        """Reserve the next swap id so the record can be written later."""
+        with self._swap_id_lock:
+            if self._last_swap_id is None:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM swaps").fetchone()
+                    seq = conn.execute(
+                        "SELECT seq FROM sqlite_sequence WHERE name = 'swaps'"
+                    ).fetchone()
+                self._last_swap_id = max(row[0], seq[0] if seq else 0)
+            self._last_swap_id += 1
+            return self._last_swap_id
 
     def create_swap(
         self,
@@ -181,23 +303,32 @@ class AnalyticsStore:
         meta: Optional[Dict[str, Any]] = None,
         input_token_usd_price: Optional[float] = None,
         input_usd: Optional[float] = None,
+        swap_id: Optional[int] = None,
+        created_at: Optional[str] = None,
     ) -> int:
-        """Create a new swap record with USD prices at trade time."""
-        created_at = datetime.now(timezone.utc).isoformat()
+        """Create a new swap record with USD prices at trade time.
+
+        swap_id comes from reserve_swap_id() when the write is deferred;
+        created_at defaults to now.
+        """
+        if swap_id is None:
+            swap_id = self.reserve_swap_id()
+        created_at = created_at or datetime.now(timezone.utc).isoformat()
         meta_dump = json.dumps(meta or {}, default=str)
 
-        with self._connect() as conn:
-            cur = conn.execute(
+        with self._writing() as conn:
+            conn.execute(
                 """
-                INSERT INTO swaps (account_id, account_label, input_token, output_token,
+                INSERT INTO swaps (id, account_id, account_label, input_token, output_token,
                                    input_amount, status, created_at, meta,
                                    input_token_usd_price, input_usd)
-                VALUES (?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, 'PENDING', ?, ?, ?, ?)
                 """,
-                (account_id, account_label, input_token, output_token, input_amount,
+                (swap_id, account_id, account_label, input_token, output_token, input_amount,
                  created_at, meta_dump, input_token_usd_price, input_usd),
             )
-            return cur.lastrowid
+        self._bump("swaps")
+        return swap_id
 
     def complete_swap(
         self,
@@ -210,11 +341,12 @@ class AnalyticsStore:
         output_usd: Optional[float] = None,
         fee_lamports: Optional[int] = None,
         fee_usd: Optional[float] = None,
+        completed_at: Optional[str] = None,
     ) -> None:
         """Mark a swap as completed with USD prices at trade time."""
-        completed_at = datetime.now(timezone.utc).isoformat()
+        completed_at = completed_at or datetime.now(timezone.utc).isoformat()
 
-        with self._connect() as conn:
+        with self._writing() as conn:
             conn.execute(
                 """
                 UPDATE swaps
@@ -233,12 +365,32 @@ class AnalyticsStore:
                 (signature, output_amount, price, slippage, completed_at,
                  output_token_usd_price, output_usd, fee_lamports, fee_usd, swap_id),
             )
+        self._bump("swaps")
 
-    def fail_swap(self, swap_id: int, error: str) -> None:
+    def update_swap_fee(
+        self,
+        swap_id: int,
+        fee_lamports: Optional[int],
+        fee_usd: Optional[float] = None,
+    ) -> None:
+        """Record a completed swap's network fee once it has been looked up."""
+        with self._writing() as conn:
+            conn.execute(
+                """
+                UPDATE swaps
+                SET fee_lamports = ?,
+                    fee_usd = ?
+                WHERE id = ?
+                """,
+                (fee_lamports, fee_usd, swap_id),
+            )
+        self._bump("swaps")
+
+    def fail_swap(self, swap_id: int, error: str, completed_at: Optional[str] = None) -> None:
         """Mark a swap as failed."""
-        completed_at = datetime.now(timezone.utc).isoformat()
+        completed_at = completed_at or datetime.now(timezone.utc).isoformat()
 
-        with self._connect() as conn:
+        with self._writing() as conn:
             conn.execute(
                 """
                 UPDATE swaps
@@ -249,26 +401,54 @@ class AnalyticsStore:
                 """,
                 (error, completed_at, swap_id),
             )
+        self._bump("swaps")
 
     def list_swaps(
         self,
         account_id: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 100,
+        with_previous_output: bool = False,
     ) -> List[Dict[str, Any]]:
-        """List swaps with optional filters."""
-        query = "SELECT * FROM swaps WHERE 1=1"
+        """
+        List swaps with optional filters.
+
+        With with_previous_output, completed swaps also carry prev_output_amount:
+        the output amount of the account's previous completed swap into the
+        same token (one windowed query instead of a lookup per row).
+        """
         params: List[Any] = []
+        if with_previous_output:
+            inner_filter = ""
+            if account_id:
+                inner_filter = " AND account_id = ?"
+                params.append(account_id)
+            query = f"""
+                SELECT s.*, p.prev_output_amount
+                FROM swaps s
+                LEFT JOIN (
+                    SELECT id, LAG(output_amount) OVER (
+                        PARTITION BY account_id, output_token ORDER BY created_at
+                    ) AS prev_output_amount
+                    FROM swaps
+                    WHERE status = 'COMPLETED'{inner_filter}
+                ) p ON p.id = s.id
+                WHERE 1=1
+            """
+            column = "s."
+        else:
+            query = "SELECT * FROM swaps WHERE 1=1"
+            column = ""
 
         if account_id:
-            query += " AND account_id = ?"
+            query += f" AND {column}account_id = ?"
             params.append(account_id)
 
         if status:
-            query += " AND status = ?"
+            query += f" AND {column}status = ?"
             params.append(status)
 
-        query += " ORDER BY created_at DESC LIMIT ?"
+        query += f" ORDER BY {column}created_at DESC LIMIT ?"
         params.append(limit)
 
         with self._connect() as conn:
@@ -525,11 +705,12 @@ class AnalyticsStore:
         """Record a price tick."""
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        with self._connect() as conn:
+        with self._writing() as conn:
             conn.execute(
                 "INSERT INTO price_ticks (symbol, price, timestamp) VALUES (?, ?, ?)",
                 (symbol, price, timestamp),
             )
+        self._bump("prices")
 
     def list_price_ticks(
         self,
@@ -0,0 +1,142 @@
+"""Background batching of analytics writes."""
+import asyncio
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+if TYPE_CHECKING:
+    from services.analytics_store import AnalyticsStore
+
+
+# (AnalyticsStore method name, keyword arguments)
+_Op = Tuple[str, Dict[str, Any]]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class AnalyticsWriter:
+    """Queues analytics writes and applies them to SQLite in batches off the request path.
+
+    Exposes the write methods of AnalyticsStore that callers use (record_signal,
+    create_swap, complete_swap, update_swap_fee, fail_swap), so either can be passed where a
+    recorder is expected. Writes are applied in the order they were queued.
+    """
+
+    def __init__(
+        self,
+        analytics: "AnalyticsStore",
+        max_batch: int = 100,
+        max_wait: float = 0.05,
+    ):
+        self.analytics = analytics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "asyncio.Queue[Optional[_Op]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the writer task (call from within the running event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Flush queued writes and stop the writer task."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    def _enqueue(self, op: str, kwargs: Dict[str, Any]) -> None:
+        # Best effort: a write that cannot be queued is logged, never raised.
+        try:
+            self._queue.put_nowait((op, kwargs))
+        except Exception as exc:
+            logger.error("Failed to queue analytics {}: {}", op, exc)
+
+    def record_signal(self, **signal: Any) -> None:
+        """Queue a signal; takes the same keyword arguments as AnalyticsStore.record_signal."""
+        # Stamp now so the stored time reflects receipt, not the flush.
+        signal.setdefault("received_at", _utc_now())
+        self._enqueue("record_signal", signal)
+
+    def create_swap(self, **swap: Any) -> int:
+        """
+        Queue a swap record; takes the same keyword arguments as AnalyticsStore.create_swap.
+
+        Returns:
+            The swap id, reserved immediately so later updates can reference it
+        """
+        swap_id = self.analytics.reserve_swap_id()
+        swap["swap_id"] = swap_id
+        swap.setdefault("created_at", _utc_now())
+        self._enqueue("create_swap", swap)
+        return swap_id
+
+    def complete_swap(self, **swap: Any) -> None:
+        """Queue a swap completion; takes the same keyword arguments as AnalyticsStore.complete_swap."""
+        swap.setdefault("completed_at", _utc_now())
+        self._enqueue("complete_swap", swap)
+
+    def update_swap_fee(self, **fee: Any) -> None:
+        """Queue a swap fee update; takes the same keyword arguments as AnalyticsStore.update_swap_fee."""
+        self._enqueue("update_swap_fee", fee)
+
+    def fail_swap(self, swap_id: int, error: str) -> None:
+        """Queue a swap failure."""
+        self._enqueue("fail_swap", {"swap_id": swap_id, "error": error, "completed_at": _utc_now()})
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch: List[_Op] = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[_Op]) -> None:
+        try:
+            await asyncio.to_thread(self._apply, batch)
+        except Exception as exc:
+            logger.error("Failed to write {} analytics record(s): {}", len(batch), exc)
+
+    def _apply(self, batch: List[_Op]) -> None:
+        """Apply queued writes in order in one transaction; consecutive signals share one insert."""
+        with self.analytics.batch():
+            signals: List[Dict[str, Any]] = []
+            for op, kwargs in batch:
+                if op == "record_signal":
+                    signals.append(kwargs)
+                    continue
+                if signals:
+                    self._write_signals(signals)
+                    signals = []
+                try:
+                    getattr(self.analytics, op)(**kwargs)
+                except Exception as exc:
+                    logger.error("Failed to write analytics {}: {}", op, exc)
+            if signals:
+                self._write_signals(signals)
+
+    def _write_signals(self, signals: List[Dict[str, Any]]) -> None:
+        try:
+            self.analytics.record_signals(signals)
+        except Exception as exc:
+            logger.error("Failed to write {} signal record(s): {}", len(signals), exc)
@@ -1,15 +1,88 @@
 """Dashboard API endpoints for SOL Swap."""
-import json
-import httpx
-from typing import Optional, Dict, Any, List
+import asyncio
+import gzip
+import hashlib
+import os
+import time
+import orjson
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timezone, timedelta
-from zoneinfo import ZoneInfo
-from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from loguru import logger
+from spl.token.constants import TOKEN_PROGRAM_ID
 
+from utils.coalesce import Coalescer
+from utils.sparkline import sparkline_segments
 
-router = APIRouter()
+try:
+    from spl.token_2022.constants import TOKEN_2022_PROGRAM_ID
+except Exception:
+    TOKEN_2022_PROGRAM_ID = None
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+# Base58 program ids, encoded once rather than per balances request.
+_TOKEN_PROGRAM_ID_STR = str(TOKEN_PROGRAM_ID)
+# Fallback Token-2022 program id for environments without spl.token_2022
+_TOKEN_2022_PROGRAM_ID_STR = (
+    str(TOKEN_2022_PROGRAM_ID)
+    if TOKEN_2022_PROGRAM_ID
+    else "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+)
+_TOKEN_PROGRAM_IDS = (_TOKEN_PROGRAM_ID_STR, _TOKEN_2022_PROGRAM_ID_STR)
+
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Swap listings at or above this limit are streamed row by row.
+_STREAM_SWAPS_MIN_LIMIT = 200
+
+# symbol -> ((tick count, first ts, last ts), sparkline segments); symbols with price ticks only
+_SPARKLINE_CACHE: Dict[str, Any] = {}
+
+# Display symbols for mints that Jupiter metadata does not name well.
+_SYMBOL_OVERRIDES = {
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB": "USDT",
+    "BFgdzMkTPdKKJeTipv2njtDEwhKxkgFueJQfJGt1jups": "URANUS",
+    "pumpCmXqMfrsAkQ5r49WcJnRayYRqmXz6ae8H7H9Dfn": "PUMP",
+}
+
+# Topics pushed over /api/stream and how often their versions are checked.
+_STREAM_TOPICS = ("swaps", "signals", "prices")
+_STREAM_POLL_SECONDS = 1.0
+_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# Concurrent pollers asking for the same data share one computation.
+_PRICE_HISTORY_FLIGHTS = Coalescer()
+_BALANCE_FLIGHTS = Coalescer()
+
+
+# How long a computed balances response is reused for the same account and baseline.
+_BALANCE_CACHE_TTL = 3.0
+
+
+def _json_etag_body(payload: Any) -> Tuple[bytes, str]:
+    """Serialize payload and derive its strong ETag."""
+    body = orjson.dumps(payload)
+    return body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _json_etag_response(request: Request, payload: Any) -> Response:
+    """Serialize payload once and answer 304 when the client already has it."""
+    body, etag = _json_etag_body(payload)
+    return _etag_body_response(request, body, etag)
+
+
+def _etag_body_response(request: Request, body: bytes, etag: str) -> Response:
+    """Answer 304 for a matching If-None-Match, otherwise the already-encoded body."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 def _parse_baseline_iso(baseline_iso: Optional[str]) -> Optional[str]:
@@ -31,1004 +104,345 @@ def _parse_baseline_iso(baseline_iso: Optional[str]) -> Optional[str]:
     return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def _get_analytics(request: Request):
-    """Get analytics store from app state."""
-    analytics = getattr(request.app.state, "analytics", None)
+# Set by create_app via set_dashboard_services; app.state is the fallback.
+_analytics: Optional[Any] = None
+_account_manager: Optional[Any] = None
+
+
+def set_dashboard_services(analytics: Any, account_manager: Any) -> None:
+    """Register the instances the dashboard dependencies return."""
+    global _analytics, _account_manager
+    _analytics = analytics
+    _account_manager = account_manager
+
+
+async def get_analytics(request: Request):
+    """Dependency returning the analytics store.
+
+    Async so FastAPI resolves it on the event loop rather than a worker thread.
+    """
+    analytics = _analytics or getattr(request.app.state, "analytics", None)
     if not analytics:
         raise HTTPException(status_code=500, detail="Analytics not initialized")
     return analytics
 
 
-def _get_account_manager(request: Request):
-    """Get account manager from app state."""
-    manager = getattr(request.app.state, "account_manager", None)
+async def get_account_manager(request: Request):
+    """Dependency returning the account manager."""
+    manager = _account_manager or getattr(request.app.state, "account_manager", None)
     if not manager:
         raise HTTPException(status_code=500, detail="Account manager not initialized")
     return manager
 
 
+_TOKEN_METADATA_TTL = 6 * 3600.0
+_TOKEN_METADATA_FAIL_COOLDOWN = 300.0
+_TOKEN_METADATA_PATH = "./data/token_metadata.json"
+
+
+def load_token_metadata_cache(app, path: str = _TOKEN_METADATA_PATH) -> int:
+    """Seed app.state.token_metadata from disk; returns the number of entries."""
+    try:
+        with open(path, "rb") as f:
+            cache = orjson.loads(f.read())
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        logger.warning("Failed to load token metadata cache: {}", e)
+        return 0
+    if not isinstance(cache, dict):
+        return 0
+    app.state.token_metadata = cache
+    return len(cache)
+
+
+def _save_token_metadata_cache(cache: Dict[str, Any], path: str = _TOKEN_METADATA_PATH) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning("Failed to save token metadata cache: {}", e)
+
+
+def _token_metadata_age(entry: Any, now: float) -> Optional[float]:
+    """Return how old a cache entry is in seconds, or None if it must be refetched."""
+    if not isinstance(entry, dict):
+        return None
+    cached_at = entry.get("_cached_at")
+    if not cached_at:
+        return 0.0
+    if not isinstance(cached_at, (int, float)):
+        return None
+    return now - cached_at
+
+
 async def _get_token_metadata(
     request: Request,
     mints: Optional[List[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
-    """Fetch and cache token metadata (symbol/name) keyed by mint."""
-    cache = getattr(request.app.state, "token_metadata", None) or {}
+    """Fetch and cache token metadata (symbol/name) keyed by mint.
+
+    Missing or expired mints are fetched inline. Entries past half their TTL
+    are served as-is while a background task refreshes them.
+    """
+    app = request.app
+    cache = getattr(app.state, "token_metadata", None) or {}
     if not isinstance(cache, dict):
         cache = {}
-    request.app.state.token_metadata = cache
+    app.state.token_metadata = cache
 
     target_mints = [str(m) for m in (mints or []) if m]
     if not target_mints:
         return cache
 
-    now = datetime.now(timezone.utc)
-    ttl = timedelta(hours=6)
-    fail_cooldown = timedelta(minutes=5)
+    # Entries carry wall-clock epoch seconds because they are persisted to disk.
+    now = time.time()
+    half_ttl = _TOKEN_METADATA_TTL / 2
+    missing: List[str] = []
+    aging: List[str] = []
+    for mint in target_mints:
+        age = _token_metadata_age(cache.get(mint), now)
+        if age is None or age >= _TOKEN_METADATA_TTL:
+            missing.append(mint)
+        elif age >= half_ttl:
+            aging.append(mint)
+
+    if missing:
+        return await _refresh_token_metadata(app, missing, _TOKEN_METADATA_TTL)
+
+    if aging and not getattr(app.state, "token_metadata_refreshing", False):
+        app.state.token_metadata_refreshing = True
+        app.state.token_metadata_refresh_task = asyncio.create_task(
+            _background_refresh_token_metadata(app, aging, half_ttl)
+        )
+    return cache
 
-    def _is_stale(entry: Dict[str, Any]) -> bool:
-        if not isinstance(entry, dict):
-            return True
-        cached_at_raw = entry.get("_cached_at")
-        if not cached_at_raw:
-            return False
-        try:
-            cached_at = datetime.fromisoformat(str(cached_at_raw))
-            if cached_at.tzinfo is None:
-                cached_at = cached_at.replace(tzinfo=timezone.utc)
-            return now - cached_at.astimezone(timezone.utc) >= ttl
-        except Exception:
-            return True
-
-    missing = [mint for mint in target_mints if mint not in cache or _is_stale(cache[mint])]
-    if not missing:
-        return cache
 
-    fail_ts = getattr(request.app.state, "token_metadata_fail_ts", None)
-    if isinstance(fail_ts, datetime):
-        if now - fail_ts < fail_cooldown:
+async def _background_refresh_token_metadata(app, mints: List[str], max_age: float) -> None:
+    try:
+        await _refresh_token_metadata(app, mints, max_age)
+    finally:
+        app.state.token_metadata_refreshing = False
+
+
+async def _refresh_token_metadata(
+    app,
+    mints: List[str],
+    max_age: float,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch metadata for mints older than max_age and merge it into the cache.
+
+    Callers queue on a single lock; whoever gets it after another refresh
+    finished re-checks ages first and only fetches what is still stale.
+    """
+    lock = getattr(app.state, "token_metadata_lock", None)
+    if lock is None:
+        lock = asyncio.Lock()
+        app.state.token_metadata_lock = lock
+
+    async with lock:
+        cache = app.state.token_metadata
+        wall_now = time.time()
+        stale = []
+        for mint in mints:
+            age = _token_metadata_age(cache.get(mint), wall_now)
+            if age is None or age >= max_age:
+                stale.append(mint)
+        if not stale:
             return cache
+        mints = stale
 
-    jupiter = getattr(request.app.state, "jupiter", None)
-    api_key = getattr(jupiter, "api_key", None) if jupiter else None
-    if not api_key:
-        return cache
+        now = time.monotonic()
 
-    endpoint = "https://api.jup.ag/tokens/v2/search"
-    headers = {"x-api-key": str(api_key)}
+        fail_ts = getattr(app.state, "token_metadata_fail_ts", None)
+        if fail_ts is not None and now - fail_ts < _TOKEN_METADATA_FAIL_COOLDOWN:
+            return cache
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for i in range(0, len(missing), 50):
-                chunk = missing[i:i + 50]
-                resp = await client.get(
-                    endpoint,
-                    params={"query": ",".join(chunk)},
-                    headers=headers,
-                )
-                resp.raise_for_status()
-                payload = resp.json()
-
-                if isinstance(payload, list):
-                    items = payload
-                elif isinstance(payload, dict):
-                    items = payload.get("tokens") or payload.get("data") or payload.get("results") or []
-                else:
-                    items = []
+        jupiter = getattr(app.state, "jupiter", None)
+        api_key = getattr(jupiter, "api_key", None) if jupiter else None
+        client = getattr(app.state, "http_client", None)
+        if not api_key or client is None:
+            return cache
+
+        endpoint = "https://api.jup.ag/tokens/v2/search"
+        headers = {"x-api-key": str(api_key)}
+
+        async def _fetch_chunk(chunk: List[str]) -> List[Any]:
+            resp = await client.get(
+                endpoint,
+                params={"query": ",".join(chunk)},
+                headers=headers,
+            )
+            resp.raise_for_status()
+            payload = orjson.loads(resp.content)
+
+            if isinstance(payload, list):
+                return payload
+            if isinstance(payload, dict):
+                return payload.get("tokens") or payload.get("data") or payload.get("results") or []
+            return []
 
+        try:
+            # Chunks are independent, so fetch them concurrently over the shared pool.
+            results = await asyncio.gather(
+                *(_fetch_chunk(mints[i:i + 50]) for i in range(0, len(mints), 50))
+            )
+            cached_at = time.time()
+            store = cache.__setitem__
+            for items in results:
                 for item in items:
                     if not isinstance(item, dict):
                         continue
-                    mint = item.get("id") or item.get("address") or item.get("mint")
+                    get = item.get
+                    mint = get("id") or get("address") or get("mint")
                     if not mint:
                         continue
-                    cache[str(mint)] = {
-                        "symbol": item.get("symbol"),
-                        "name": item.get("name"),
-                        "_cached_at": now.isoformat(),
-                    }
-
-        request.app.state.token_metadata_fail_ts = None
-        request.app.state.token_metadata = cache
-        return cache
-    except Exception as e:
-        if not isinstance(fail_ts, datetime) or now - fail_ts >= fail_cooldown:
-            logger.warning("Failed to fetch token metadata: {}", e)
-        request.app.state.token_metadata_fail_ts = now
-        return cache
-
-
-@router.get("/", response_class=HTMLResponse)
-async def dashboard_home():
-    """Serve dashboard HTML."""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SOL Swap Dashboard</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                margin: 20px;
-                background: #1a1a1a;
-                color: #fff;
-            }
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-            }
-            h1 {
-                color: #00d4aa;
-                display: inline-block;
-                margin: 0;
-            }
-            .header-container {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 26px;
-                gap: 20px;
-                padding-top: 6px;
-            }
-            .brand {
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                min-width: 180px;
-            }
-            .logo {
-                width: 46px;
-                height: 46px;
-                flex: 0 0 auto;
-            }
-            .logo-ring {
-                fill: none;
-                stroke: #00d4aa;
-                stroke-width: 2.5;
-            }
-            .logo-swap {
-                fill: none;
-                stroke: #66f0d2;
-                stroke-width: 2.2;
-                stroke-linecap: round;
-                stroke-linejoin: round;
-            }
-            .logo-dot {
-                fill: #0b1b17;
-                stroke: #00d4aa;
-                stroke-width: 1.5;
-            }
-            .logo-sol {
-                fill: #0f2b22;
-                stroke: #00d4aa;
-                stroke-width: 1.6;
-            }
-            .logo-sol-text {
-                fill: #00d4aa;
-                font-size: 9px;
-                font-family: Arial, sans-serif;
-                font-weight: bold;
-                letter-spacing: 0.4px;
-            }
-            .price-charts {
-                flex: 1;
-                display: grid;
-                grid-template-columns: repeat(2, minmax(200px, 1fr));
-                gap: 12px;
-                margin-top: 10px;
-            }
-            .price-card {
-                background: #202020;
-                border: 1px solid #333;
-                border-radius: 8px;
-                padding: 10px 12px;
-            }
-            .price-body {
-                display: flex;
-                align-items: flex-start;
-                gap: 12px;
-            }
-            .price-meta {
-                display: flex;
-                flex-direction: column;
-                min-width: 90px;
-            }
-            .price-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: baseline;
-                margin-bottom: 2px;
-            }
-            .price-title {
-                font-size: 12px;
-                color: #aaa;
-                text-transform: uppercase;
-                letter-spacing: 0.06em;
-            }
-            .price-value {
-                font-size: 16px;
-                font-weight: 600;
-            }
-            .price-change {
-                font-size: 13px;
-                font-weight: 600;
-                margin-top: 2px;
-            }
-            .price-change.up { color: #00d4aa; }
-            .price-change.down { color: #ff6666; }
-            .price-chart {
-                width: 100%;
-                height: 86px;
-                margin-top: -16px;
-            }
-            .clock-container {
-                text-align: right;
-                font-family: monospace;
-            }
-            .clock-nl {
-                font-size: 20px;
-                font-weight: bold;
-                color: #00d4aa;
-            }
-            .clock-utc {
-                font-size: 12px;
-                color: #888;
-                margin-top: 5px;
-            }
-            .baseline-control {
-                margin-top: 10px;
-                display: flex;
-                flex-direction: column;
-                gap: 4px;
-                align-items: flex-end;
-            }
-            .baseline-control label {
-                font-size: 11px;
-                color: #999;
-                letter-spacing: 0.2px;
-            }
-            .baseline-control input {
-                background: #1f1f1f;
-                color: #ddd;
-                border: 1px solid #444;
-                border-radius: 6px;
-                padding: 4px 8px;
-                font-size: 12px;
-            }
-            .loading {
-                color: #aaa;
-                font-size: 12px;
-                opacity: 0.8;
-            }
-            .section {
-                background: #2a2a2a;
-                padding: 20px;
-                margin: 12px 0;
-                border-radius: 8px;
-            }
-            .section h2 {
-                margin-top: 0;
-            }
-            .section-header {
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                margin-bottom: 8px;
-            }
-            .section-header h2 {
-                margin: 0;
-            }
-            .swaps-controls select {
-                background: #1f1f1f;
-                color: #fff;
-                border: 1px solid #444;
-                border-radius: 6px;
-                padding: 4px 8px;
-                font-size: 12px;
-            }
-            .swaps-totals {
-                margin-top: 6px;
-                color: #aaa;
-                font-size: 12px;
-            }
-            .asset-tabs {
-                display: flex;
-                gap: 10px;
-                margin: 10px 0 14px;
-                flex-wrap: wrap;
-            }
-            .asset-tab {
-                background: #242424;
-                border: 1px solid #3a3a3a;
-                color: #d6d6d6;
-                padding: 6px 12px;
-                border-radius: 999px;
-                font-size: 12px;
-                cursor: pointer;
-                transition: all 0.15s ease;
-            }
-            .asset-tab.active {
-                background: #0f2b22;
-                border-color: #00d4aa;
-                color: #00d4aa;
-                box-shadow: 0 0 0 1px rgba(0, 212, 170, 0.2);
-            }
-            .asset-tab:hover {
-                border-color: #00d4aa;
-            }
-            .signal-pill {
-                display: inline-flex;
-                align-items: center;
-                padding: 2px 8px;
-                border-radius: 999px;
-                font-size: 12px;
-                font-weight: 600;
-                letter-spacing: 0.2px;
-                background: rgba(255, 255, 255, 0.06);
-                color: #e5e5e5;
-            }
-            .signal-type-mr-low { background: rgba(0, 200, 255, 0.15); color: #7fe4ff; }
-            .signal-type-mean { background: rgba(255, 206, 86, 0.15); color: #ffd56e; }
-            .signal-type-conf { background: rgba(0, 212, 127, 0.15); color: #60e6a9; }
-            .signal-type-trend { background: rgba(0, 168, 255, 0.15); color: #7fc8ff; }
-            .signal-type-unknown { background: rgba(255, 255, 255, 0.08); color: #cfcfcf; }
-            .signal-timeframe { background: rgba(255, 255, 255, 0.08); color: #cfd5ff; }
-            .total-value {
-                font-size: 14px;
-                font-weight: 600;
-                color: #00d4aa;
-            }
-            .balances-header {
-                display: flex;
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 4px;
-                margin-bottom: 4px;
-            }
-            .balances-header h2 {
-                margin: 0;
-            }
-            table {
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 10px;
-            }
-            th, td {
-                padding: 12px;
-                text-align: left;
-                border-bottom: 1px solid #444;
-                font-size: 13px;
-            }
-            th {
-                background: #333;
-                color: #00d4aa;
-            }
-            .success, .completed { color: #00d4aa; }
-            .error, .failed { color: #ff4444; }
-            .pending { color: #ffaa00; }
-            .change-up { color: #00d4aa; }
-            .change-down { color: #ff6666; }
-            .change-flat { color: #aaa; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header-container">
-                <div class="brand">
-                    <svg class="logo" viewBox="0 0 48 48" aria-label="SOL Swap logo" role="img">
-                        <defs>
-                            <linearGradient id="sol-gradient" x1="0%" y1="0%" x2="100%" y2="0%">
-                                <stop offset="0%" stop-color="#14F195"/>
-                                <stop offset="100%" stop-color="#9945FF"/>
-                            </linearGradient>
-                        </defs>
-                        <circle class="logo-ring" cx="24" cy="24" r="21"/>
-                        <path class="logo-swap" d="M14 20h12a6 6 0 0 1 6 6v4"/>
-                        <path class="logo-swap" d="M34 28H22a6 6 0 0 1-6-6v-4"/>
-                        <polyline class="logo-swap" points="30,32 34,28 30,24"/>
-                        <polyline class="logo-swap" points="18,16 14,20 18,24"/>
-                        <circle class="logo-dot" cx="14" cy="20" r="2.4"/>
-                        <circle class="logo-dot" cx="34" cy="28" r="2.4"/>
-                        <rect x="17" y="18" width="14" height="4" rx="2" fill="url(#sol-gradient)"/>
-                        <rect x="17" y="24" width="14" height="4" rx="2" fill="url(#sol-gradient)"/>
-                        <rect x="17" y="30" width="14" height="4" rx="2" fill="url(#sol-gradient)"/>
-                    </svg>
-                    <h1>SOL Swap</h1>
-                </div>
-                <div class="price-charts">
-                    <div class="price-card" id="price-card-sol">
-                        <div class="price-header">
-                            <div class="price-title" id="price-title-0">Token (24h)</div>
-                        </div>
-                        <div class="price-body">
-                            <div class="price-meta">
-                                <div class="price-value" id="price-value-0">$--</div>
-                                <div class="price-change" id="price-change-0">--</div>
-                            </div>
-                            <div class="price-chart" id="price-chart-0"></div>
-                        </div>
-                    </div>
-                    <div class="price-card" id="price-card-skr">
-                        <div class="price-header">
-                            <div class="price-title" id="price-title-1">Token (24h)</div>
-                        </div>
-                        <div class="price-body">
-                            <div class="price-meta">
-                                <div class="price-value" id="price-value-1">$--</div>
-                                <div class="price-change" id="price-change-1">--</div>
-                            </div>
-                            <div class="price-chart" id="price-chart-1"></div>
-                        </div>
-                    </div>
-                </div>
-                <div class="clock-container">
-                    <div class="clock-nl" id="clock-nl">--:--:-- --</div>
-                    <div class="clock-utc" id="clock-utc">UTC: --:--:--</div>
-                    <div class="baseline-control">
-                        <label for="balance-baseline">Change Start</label>
-                        <input type="datetime-local" id="balance-baseline" />
-                    </div>
-                </div>
-            </div>
-            <div class="asset-tabs" id="asset-tabs"></div>
-            <div class="section">
-                <div class="balances-header">
-                    <h2>💰 Wallet Balances</h2>
-                    <div id="balances-total" class="total-value">Total Value: --</div>
-                </div>
-                <div id="balances" class="loading">Loading...</div>
-            </div>
-
-            <div class="section">
-                <div class="section-header">
-                    <h2>Recent Swaps</h2>
-                    <div class="swaps-controls">
-                        <label for="swaps-limit" style="color:#aaa;font-size:12px;margin-right:6px;">Show</label>
-                        <select id="swaps-limit">
-                            <option value="10" selected>10</option>
-                            <option value="25">25</option>
-                            <option value="50">50</option>
-                            <option value="100">100</option>
-                        </select>
-                    </div>
-                </div>
-                <div id="swaps-totals" class="swaps-totals">Totals since --: --</div>
-                <div id="swaps">Loading...</div>
-            </div>
-
-            <div class="section">
-                <div class="section-header">
-                    <h2>Recent Signals</h2>
-                    <div class="swaps-controls">
-                        <label for="signals-sort" style="color:#aaa;font-size:12px;margin-right:6px;">Sort</label>
-                        <select id="signals-sort">
-                            <option value="time" selected>Time</option>
-                            <option value="type">Type</option>
-                            <option value="timeframe">Timeframe</option>
-                        </select>
-                    </div>
-                </div>
-                <div id="signals">Loading...</div>
-            </div>
-        </div>
-
-        <script>
-            let assets = [];
-            let currentAsset = null;
-            let currentTokens = ["SOL", "SKR"];
-            const BALANCE_BASELINE_KEY = "balanceBaselineIso";
-
-            // Format dates in Newfoundland Time (12-hour format)
-            function formatNLTime(dateString) {
-                // Handle legacy timestamps without timezone info by treating them as UTC
-                if (dateString && !dateString.includes('+') && !dateString.endsWith('Z')) {
-                    dateString = dateString + 'Z';
-                }
-                return new Date(dateString).toLocaleString('en-US', {
-                    timeZone: 'America/St_Johns',
-                    year: 'numeric',
-                    month: '2-digit',
-                    day: '2-digit',
-                    hour: 'numeric',
-                    minute: '2-digit',
-                    second: '2-digit',
-                    hour12: true
-                });
-            }
-
-            // Update live clocks
-            function updateClocks() {
-                const now = new Date();
-
-                // Newfoundland Time
-                const nlTime = now.toLocaleString('en-US', {
-                    timeZone: 'America/St_Johns',
-                    hour: 'numeric',
-                    minute: '2-digit',
-                    second: '2-digit',
-                    hour12: true
-                });
-                document.getElementById('clock-nl').textContent = nlTime;
-
-                // UTC Time
-                const utcTime = now.toLocaleString('en-US', {
-                    timeZone: 'UTC',
-                    hour: 'numeric',
-                    minute: '2-digit',
-                    second: '2-digit',
-                    hour12: true
-                });
-                document.getElementById('clock-utc').textContent = 'UTC: ' + utcTime;
-            }
-
-            // Update clocks every second
-            updateClocks();
-            setInterval(updateClocks, 1000);
-
-            let lastBalancesHtml = null;
-            let lastBalancesTotal = null;
-
-            function renderSparkline(prices, width = 220, height = 86) {
-                if (!prices || prices.length < 2) {
-                    return '<div style="color:#666;font-size:12px;">No data yet</div>';
-                }
+                    store(str(mint), {
+                        "symbol": get("symbol"),
+                        "name": get("name"),
+                        "_cached_at": cached_at,
+                    })
+
+            app.state.token_metadata_fail_ts = None
+            await asyncio.to_thread(_save_token_metadata_cache, dict(cache))
+            return cache
+        except Exception as e:
+            if fail_ts is None or now - fail_ts >= _TOKEN_METADATA_FAIL_COOLDOWN:
+                logger.warning("Failed to fetch token metadata: {}", e)
+            app.state.token_metadata_fail_ts = now
+            return cache
 
-                const values = prices.map(p => p.price);
-                const min = Math.min(...values);
-                const max = Math.max(...values);
-                const mean = values.reduce((sum, v) => sum + v, 0) / values.length;
-                const range = max - min || 1;
-
-                const points = prices.map((p, i) => {
-                    const x = (i / (prices.length - 1)) * (width - 4) + 2;
-                    const y = height - ((p.price - min) / range) * height;
-                    const above = p.price >= mean;
-                    return { x, y, above };
-                });
-
-                const segments = [];
-                let current = [points[0]];
-                let currentAbove = points[0].above;
-
-                for (let i = 1; i < points.length; i++) {
-                    const point = points[i];
-                    if (point.above === currentAbove) {
-                        current.push(point);
-                    } else {
-                        // start a new segment including the last point for continuity
-                        segments.push({ above: currentAbove, points: current });
-                        current = [points[i - 1], point];
-                        currentAbove = point.above;
-                    }
-                }
-                segments.push({ above: currentAbove, points: current });
-
-                const polylines = segments.map(seg => {
-                    const stroke = seg.above ? "#00d4aa" : "#ff6666";
-                    const segPoints = seg.points
-                        .map(p => `${p.x.toFixed(2)},${p.y.toFixed(2)}`)
-                        .join(" ");
-                    return `<polyline points="${segPoints}" fill="none" stroke="${stroke}" stroke-width="2" />`;
-                }).join("");
-
-                return `
-                    <svg viewBox="0 0 ${width} ${height}" width="100%" height="100%">
-                        ${polylines}
-                    </svg>
-                `;
-            }
-
-            function updatePriceCard(index, symbol, data) {
-                const prices = data.prices || [];
-                const current = data.current_price ?? null;
-                const changePct = data.change_pct ?? null;
-                const upper = (symbol || "").toUpperCase();
-                const priceDecimals = upper === "SOL" || upper === "USDC" ? 2 : 4;
-
-                const valueEl = document.getElementById(`price-value-${index}`);
-                const changeEl = document.getElementById(`price-change-${index}`);
-                const chartEl = document.getElementById(`price-chart-${index}`);
-                const titleEl = document.getElementById(`price-title-${index}`);
-
-                if (current === null) {
-                    valueEl.textContent = "$--";
-                    changeEl.textContent = "--";
-                    chartEl.innerHTML = renderSparkline(prices);
-                    if (titleEl) {
-                        titleEl.textContent = symbol ? `${symbol} (24h)` : "Token (24h)";
-                    }
-                    return;
-                }
 
-                if (titleEl) {
-                    titleEl.textContent = symbol ? `${symbol} (24h)` : "Token (24h)";
-                }
-                valueEl.textContent = `$${current.toFixed(priceDecimals)}`;
-                if (changePct === null) {
-                    changeEl.textContent = "--";
-                    changeEl.className = "price-change";
-                } else {
-                    const sign = changePct >= 0 ? "+" : "";
-                    changeEl.textContent = `${sign}${changePct.toFixed(2)}%`;
-                    changeEl.className = `price-change ${changePct >= 0 ? "up" : "down"}`;
-                }
+# The page lives in static/dashboard.html and is read once at import.
+_DASHBOARD_HTML_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "dashboard.html"
+)
+with open(_DASHBOARD_HTML_PATH, encoding="utf-8") as _html_file:
+    _DASHBOARD_HTML = _html_file.read()
+
+# Strip indentation and blank lines only; newlines stay so inline JS
+# `//` comments and automatic semicolon insertion keep working.
+_DASHBOARD_HTML_BYTES = "\n".join(
+    line.strip() for line in _DASHBOARD_HTML.splitlines() if line.strip()
+).encode("utf-8")
+_DASHBOARD_HTML_GZIP = gzip.compress(_DASHBOARD_HTML_BYTES, compresslevel=9)
+_DASHBOARD_HTML_BR = (
+    brotli.compress(_DASHBOARD_HTML_BYTES, quality=11) if brotli else None
+)
+_DASHBOARD_HASH = hashlib.sha256(_DASHBOARD_HTML_BYTES).hexdigest()[:32]
+
+
+def _dashboard_variant(body: bytes, suffix: str, encoding: Optional[str]) -> Tuple[bytes, Dict[str, str]]:
+    # Each encoding is a different representation, so each gets its own strong ETag.
+    headers = {
+        "ETag": f'"{_DASHBOARD_HASH}{suffix}"',
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, headers
 
-                chartEl.innerHTML = renderSparkline(prices);
-            }
 
-            async function loadPriceCharts() {
-                const symbols = currentTokens || [];
-                if (!symbols.length) {
-                    for (let i = 0; i < 2; i += 1) {
-                        updatePriceCard(i, "", {});
-                    }
-                    return;
-                }
-                const response = await fetch(`/api/price-history?symbols=${symbols.join(",")}`);
-                const data = await response.json();
-                if (data && data.data) {
-                    for (let i = 0; i < 2; i += 1) {
-                        const symbol = symbols[i];
-                        if (!symbol) {
-                            updatePriceCard(i, "", {});
-                            continue;
-                        }
-                        updatePriceCard(i, symbol, data.data[symbol] || {});
-                    }
-                }
-            }
+_DASHBOARD_IDENTITY = _dashboard_variant(_DASHBOARD_HTML_BYTES, "", None)
+_DASHBOARD_GZIP = _dashboard_variant(_DASHBOARD_HTML_GZIP, "-gz", "gzip")
+_DASHBOARD_BR = (
+    _dashboard_variant(_DASHBOARD_HTML_BR, "-br", "br") if _DASHBOARD_HTML_BR is not None else None
+)
 
-            function setActiveAsset(assetId) {
-                currentAsset = assets.find(asset => asset.id === assetId) || assets[0] || null;
-                if (!currentAsset) {
-                    return;
-                }
-                currentTokens = currentAsset.price_symbols || [];
-                if (!currentTokens.length && currentAsset.token_pair) {
-                    currentTokens = currentAsset.token_pair.split("-").filter(Boolean);
-                }
-                const tabsEl = document.getElementById('asset-tabs');
-                if (tabsEl) {
-                    Array.from(tabsEl.querySelectorAll('.asset-tab')).forEach(tab => {
-                        tab.classList.toggle('active', tab.dataset.assetId === currentAsset.id);
-                    });
-                }
-                loadSwaps();
-                loadSignals();
-                loadBalances();
-                loadPriceCharts();
-            }
-
-            async function loadAssets() {
-                const tabsEl = document.getElementById('asset-tabs');
-                if (!tabsEl) return;
-                const response = await fetch('/api/assets');
-                const data = await response.json();
-                assets = data.assets || [];
-                if (!assets.length) {
-                    assets = [{
-                        id: "wallet-1",
-                        account_id: "wallet-1",
-                        label: "Default",
-                        token_pair: "SOL-SKR",
-                        price_symbols: ["SOL", "SKR"]
-                    }];
-                }
-                tabsEl.innerHTML = assets.map(asset => `
-                    <button class="asset-tab" data-asset-id="${asset.id}">
-                        ${asset.label || asset.token_pair || asset.id}
-                    </button>
-                `).join('');
-                Array.from(tabsEl.querySelectorAll('.asset-tab')).forEach(tab => {
-                    tab.addEventListener('click', () => setActiveAsset(tab.dataset.assetId));
-                });
-                setActiveAsset(assets[0].id);
-            }
-
-            async function loadSwaps() {
-                const limitEl = document.getElementById('swaps-limit');
-                const limit = limitEl ? limitEl.value : 10;
-                const accountId = currentAsset ? (currentAsset.account_id || currentAsset.id) : null;
-                const response = await fetch(`/api/swaps?limit=${limit}${accountId ? `&account_id=${accountId}` : ''}`);
-                const data = await response.json();
-
-                const html = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Time (NST/NDT)</th>
-                                <th>Account</th>
-                                <th>Swap</th>
-                                <th>Amount</th>
-                                <th>USD Value</th>
-                                <th>Fee (USD)</th>
-                                <th>Change</th>
-                                <th>Status</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.swaps.map((swap, index) => {
-                                const inputUsd = swap.input_usd || 0;
-                                const outputUsd = swap.output_usd || 0;
-                                const usdDisplay = swap.status === 'COMPLETED'
-                                    ? `$${inputUsd.toFixed(2)} → $${outputUsd.toFixed(2)}`
-                                    : `$${inputUsd.toFixed(2)}`;
-                                const feeDisplay = swap.fee_usd == null
-                                    ? '-'
-                                    : (Number(swap.fee_usd) < 0.01
-                                        ? '<$0.01'
-                                        : `$${Number(swap.fee_usd).toFixed(2)}`);
-                                let changeDisplay = '-';
-                                let changeClass = 'change-flat';
-                                if (swap.change_pct != null) {
-                                    const changePct = Number(swap.change_pct);
-                                    const sign = changePct > 0 ? '+' : '';
-                                    changeDisplay = `${sign}${changePct.toFixed(2)}%`;
-                                    if (changePct > 0) changeClass = 'change-up';
-                                    else if (changePct < 0) changeClass = 'change-down';
-                                }
-
-                                return `
-                                <tr>
-                                    <td>${formatNLTime(swap.created_at)}</td>
-                                    <td>${swap.account_label || swap.account_id}</td>
-                                    <td>${swap.input_token} → ${swap.output_token}</td>
-                                    <td>${swap.input_amount.toFixed(4)} → ${(swap.output_amount || 0).toFixed(4)}</td>
-                                    <td>${usdDisplay}</td>
-                                    <td>${feeDisplay}</td>
-                                    <td class="${changeClass}">${changeDisplay}</td>
-                                    <td class="${swap.status.toLowerCase()}">${swap.status}</td>
-                                </tr>
-                                `;
-                            }).join('')}
-                        </tbody>
-                    </table>
-                `;
-                document.getElementById('swaps').innerHTML = html;
-
-                const totalsEl = document.getElementById('swaps-totals');
-                if (totalsEl) {
-                    const totals = data.totals || {};
-                    const parts = Object.keys(totals).sort().map(token => {
-                        const pct = totals[token].change_pct;
-                        if (pct === undefined || pct === null) {
-                            return `${token}: -`;
-                        }
-                        const sign = pct > 0 ? '+' : '';
-                        return `${token}: ${sign}${pct.toFixed(2)}%`;
-                    });
-                    const startLabel = data.totals_start
-                        ? `${formatNLTime(data.totals_start)} NST`
-                        : 'now';
-                    totalsEl.textContent = parts.length
-                        ? `Totals since ${startLabel}: ${parts.join(' | ')}`
-                        : `Totals since ${startLabel}: -`;
-                }
-            }
-
-            async function loadBalances() {
-                const balancesEl = document.getElementById("balances");
-                try {
-                    const accountId = currentAsset ? (currentAsset.account_id || currentAsset.id) : "wallet-1";
-                    const baselineInput = document.getElementById("balance-baseline");
-                    let baselineIso = null;
-                    if (baselineInput && baselineInput.value) {
-                        const parsed = new Date(baselineInput.value);
-                        if (!isNaN(parsed.getTime())) {
-                            baselineIso = parsed.toISOString();
-                            localStorage.setItem(BALANCE_BASELINE_KEY, baselineIso);
-                        }
-                    }
-                    const baselineParam = baselineIso ? `?baseline_iso=${encodeURIComponent(baselineIso)}` : "";
-                    const response = await fetch(`/api/balances/${accountId}${baselineParam}`);
-                    if (!response.ok) {
-                        if (lastBalancesHtml) {
-                            balancesEl.innerHTML = lastBalancesHtml;
-                            balancesEl.classList.add("loading");
-                        } else {
-                            balancesEl.innerHTML = '<div class="loading">Failed to load balances</div>';
-                        }
-                        return;
-                    }
-                    const data = await response.json();
-
-                    let totalUsd = data.total_usd || 0;
-                    lastBalancesTotal = totalUsd;
-                    document.getElementById("balances-total").textContent = `Total Value: $${totalUsd.toFixed(2)} USD`;
-                    balancesEl.classList.remove("loading");
-                    const html = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Token</th>
-                                <th>Balance</th>
-                                <th>Price (USD)</th>
-                                <th>Value (USD)</th>
-                                <th>Δ USD</th>
-                                <th>Δ Qty</th>
-                                <th>Change</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${(data.balances || []).map(b => {
-                                const isSol = b.token === "SOL"
-                                    || b.mint === "So11111111111111111111111111111111111111112";
-                                const priceDecimals = isSol ? 2 : 4;
-                                return `
-                                <tr>
-                                    <td>${b.token}</td>
-                                    <td>${b.balance.toFixed(6)}</td>
-                                    <td>$${(b.price_usd || 0).toFixed(priceDecimals)}</td>
-                                    <td>$${(b.value_usd || 0).toFixed(4)}</td>
-                                    <td class="${(b.change_usd ?? 0) > 0 ? 'change-up' : (b.change_usd ?? 0) < 0 ? 'change-down' : 'change-flat'}">
-                                        ${b.change_usd == null ? '-' : `${(b.change_usd > 0 ? '+' : '')}$${Math.abs(Number(b.change_usd)).toFixed(2)}`}
-                                    </td>
-                                    <td class="${(b.change_amount ?? 0) > 0 ? 'change-up' : (b.change_amount ?? 0) < 0 ? 'change-down' : 'change-flat'}">
-                                        ${b.change_amount == null ? '-' : `${(b.change_amount > 0 ? '+' : '')}${Number(b.change_amount).toFixed(6)}`}
-                                    </td>
-                                    <td class="${(b.change_pct ?? 0) > 0 ? 'change-up' : (b.change_pct ?? 0) < 0 ? 'change-down' : 'change-flat'}">
-                                        ${b.change_pct == null ? '-' : `${(b.change_pct > 0 ? '+' : '')}${b.change_pct.toFixed(2)}%`}
-                                    </td>
-                                </tr>
-                                `;
-                            }).join("")}
-                        </tbody>
-                    </table>
-                `;
-                    balancesEl.innerHTML = html;
-                    lastBalancesHtml = html;
-                } catch (error) {
-                    if (lastBalancesHtml) {
-                        balancesEl.innerHTML = lastBalancesHtml;
-                        balancesEl.classList.add("loading");
-                    } else {
-                        balancesEl.innerHTML = '<div class="loading">Failed to load balances</div>';
-                    }
-                }
-            }
-
-            async function loadSignals() {
-                const accountId = currentAsset ? (currentAsset.account_id || currentAsset.id) : null;
-                const response = await fetch(`/api/signals?limit=10${accountId ? `&account_id=${accountId}` : ''}`);
-                const data = await response.json();
-                const sortEl = document.getElementById('signals-sort');
-                const sortBy = sortEl ? sortEl.value : 'time';
-                const signals = (data.signals || []).slice();
-                if (sortBy !== 'time') {
-                    signals.sort((a, b) => {
-                        const aVal = (a[sortBy] || '').toString().toLowerCase();
-                        const bVal = (b[sortBy] || '').toString().toLowerCase();
-                        if (aVal < bVal) return -1;
-                        if (aVal > bVal) return 1;
-                        return 0;
-                    });
-                }
 
-                const html = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Time (NST/NDT)</th>
-                                <th>Action</th>
-                                <th>Symbol</th>
-                                <th>Type</th>
-                                <th>Timeframe</th>
-                                <th>Amount</th>
-                                <th>Note</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${signals.map(signal => {
-                                const typeRaw = (signal.signal_type || '').toString();
-                                const typeKey = typeRaw.toLowerCase().replace(/\\s+/g, '-');
-                                const typeClass = typeKey ? `signal-type-${typeKey}` : 'signal-type-unknown';
-                                const typeLabel = typeRaw || '-';
-                                const tfLabel = signal.timeframe || '-';
-                                return `
-                                <tr>
-                                    <td>${formatNLTime(signal.received_at)}</td>
-                                    <td>${signal.action}</td>
-                                    <td>${signal.symbol}</td>
-                                    <td><span class="signal-pill ${typeClass}">${typeLabel}</span></td>
-                                    <td><span class="signal-pill signal-timeframe">${tfLabel}</span></td>
-                                    <td>${signal.amount || '-'}</td>
-                                    <td>${signal.note || '-'}</td>
-                                </tr>
-                            `;
-                            }).join('')}
-                        </tbody>
-                    </table>
-                `;
-                document.getElementById('signals').innerHTML = html;
-            }
-
-            // Load data
-            const baselineInput = document.getElementById("balance-baseline");
-            if (baselineInput) {
-                const storedBaselineIso = localStorage.getItem(BALANCE_BASELINE_KEY);
-                const baselineDate = storedBaselineIso ? new Date(storedBaselineIso) : new Date();
-                if (!isNaN(baselineDate.getTime())) {
-                    const localIso = new Date(baselineDate.getTime() - baselineDate.getTimezoneOffset() * 60000)
-                        .toISOString()
-                        .slice(0, 16);
-                    baselineInput.value = localIso;
-                }
-                baselineInput.addEventListener("change", () => {
-                    if (currentAsset) {
-                        loadBalances();
-                    }
-                });
-            }
-
-            loadAssets();
-
-            // Refresh every 5 seconds
-            setInterval(() => {
-                if (!currentAsset) {
-                    return;
-                }
-                loadSwaps();
-                loadSignals();
-                loadBalances();
-                loadPriceCharts();
-            }, 5000);
-
-            const swapsLimit = document.getElementById('swaps-limit');
-            if (swapsLimit) {
-                swapsLimit.addEventListener('change', () => loadSwaps());
-            }
-            const signalsSort = document.getElementById('signals-sort');
-            if (signalsSort) {
-                signalsSort.addEventListener('change', () => loadSignals());
-            }
-        </script>
-    </body>
-    </html>
-    """
+@router.get("/", response_class=HTMLResponse)
+async def dashboard_home(request: Request):
+    """Serve dashboard HTML, precompressed when the client accepts br or gzip."""
+    accepted = {
+        part.split(";", 1)[0].strip().lower()
+        for part in request.headers.get("accept-encoding", "").split(",")
+    }
+    if _DASHBOARD_BR is not None and "br" in accepted:
+        body, headers = _DASHBOARD_BR
+    elif "gzip" in accepted:
+        body, headers = _DASHBOARD_GZIP
+    else:
+        body, headers = _DASHBOARD_IDENTITY
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
 
 
 @router.get("/api/price-history")
 async def get_price_history(
     request: Request,
     symbols: str = "SOL,SKR",
+    analytics=Depends(get_analytics),
 ) -> Dict[str, Any]:
     """Get 24h price history for one or more symbols."""
-    analytics = _get_analytics(request)
-    data: Dict[str, Any] = {}
+    key = tuple(s for s in (raw.strip().upper() for raw in symbols.split(",")) if s)
+    data = await _PRICE_HISTORY_FLIGHTS.run(
+        key, lambda: _compute_price_history(analytics, key)
+    )
+    return _json_etag_response(request, {"data": data})
+
 
-    for raw_symbol in symbols.split(","):
-        symbol = raw_symbol.strip().upper()
-        if not symbol:
-            continue
+async def _compute_price_history(analytics, symbols) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
 
+    for symbol in symbols:
         ticks = analytics.list_price_ticks(symbol=symbol, hours=24)
         current_price = ticks[-1]["price"] if ticks else None
         change_pct = None
         if len(ticks) >= 2 and ticks[0]["price"]:
             change_pct = ((current_price - ticks[0]["price"]) / ticks[0]["price"]) * 100
 
+        # Every poller sees the same ticks, so build the chart geometry once per tick.
+        cache_key = (
+            len(ticks),
+            ticks[0]["timestamp"] if ticks else None,
+            ticks[-1]["timestamp"] if ticks else None,
+        )
+        cached = _SPARKLINE_CACHE.get(symbol)
+        if cached and cached[0] == cache_key:
+            sparkline = cached[1]
+        else:
+            sparkline = sparkline_segments([tick["price"] for tick in ticks])
+            # Only symbols with recorded prices are kept, so arbitrary ?symbols= values
+            # cannot grow the cache.
+            if ticks:
+                _SPARKLINE_CACHE[symbol] = (cache_key, sparkline)
+
         data[symbol] = {
             "prices": ticks,
             "current_price": current_price,
             "change_pct": change_pct,
+            "sparkline": sparkline,
         }
 
-    return {"data": data}
+    return data
 
 
 @router.get("/api/swaps")
 async def get_swaps(
     request: Request,
+    response: Response,
     limit: int = 10,
     account_id: Optional[str] = None,
     status: Optional[str] = None,
+    analytics=Depends(get_analytics),
 ) -> Dict[str, Any]:
     """Get swap history with historical USD values."""
-    analytics = _get_analytics(request)
+
+    etag = f'W/"swaps-{analytics.instance_id}-{analytics.get_version("swaps")}-{limit}-{status or "_"}-{account_id or "_"}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
     swaps = analytics.list_swaps(
         account_id=account_id,
         status=status,
         limit=limit,
+        with_previous_output=True,
     )
 
     # USD values are already stored in the database from trade time
@@ -1038,17 +452,11 @@ async def get_swaps(
             swap["input_usd"] = 0
         if swap.get("output_usd") is None:
             swap["output_usd"] = 0
+        prev_out = swap.pop("prev_output_amount", None)
         swap["change_pct"] = None
-        if swap.get("status") == "COMPLETED" and swap.get("output_amount"):
-            prev = analytics.get_previous_completed_swap(
-                account_id=swap["account_id"],
-                output_token=swap["output_token"],
-                before_created_at=swap["created_at"],
-            )
-            if prev and prev.get("output_amount"):
-                prev_out = float(prev["output_amount"])
-                if prev_out != 0:
-                    swap["change_pct"] = ((float(swap["output_amount"]) - prev_out) / prev_out) * 100
+        if swap.get("status") == "COMPLETED" and swap.get("output_amount") and prev_out:
+            prev_out = float(prev_out)
+            swap["change_pct"] = ((float(swap["output_amount"]) - prev_out) / prev_out) * 100
     # Totals since configured start (default: app start time)
     totals_start = getattr(request.app.state, "totals_start", None)
     if totals_start is None:
@@ -1057,39 +465,94 @@ async def get_swaps(
     start_iso = totals_start.astimezone(timezone.utc).isoformat()
     totals = analytics.get_output_change_totals(since_iso=start_iso, account_id=account_id)
 
+    if limit >= _STREAM_SWAPS_MIN_LIMIT:
+        return StreamingResponse(
+            _stream_swaps(swaps, totals, start_iso),
+            media_type="application/json",
+            headers=cache_headers,
+        )
+
+    response.headers.update(cache_headers)
     return {"swaps": swaps, "totals": totals, "totals_start": start_iso}
 
 
+async def _stream_swaps(
+    swaps: List[Dict[str, Any]],
+    totals: Dict[str, Dict[str, float]],
+    start_iso: str,
+):
+    """Yield the swaps payload one encoded row at a time."""
+    yield b'{"swaps":['
+    for i, swap in enumerate(swaps):
+        yield (b"," if i else b"") + orjson.dumps(swap)
+    yield b'],"totals":' + orjson.dumps(totals) + b',"totals_start":' + orjson.dumps(start_iso) + b"}"
+
+
+@router.get("/api/stream")
+async def stream_updates(
+    request: Request,
+    analytics=Depends(get_analytics),
+) -> StreamingResponse:
+    """Server-sent events naming each topic whose data changed.
+
+    Events carry no payload beyond the process-scoped topic version; clients
+    refetch the matching endpoint, which then revalidates through its ETag.
+    """
+
+    async def _events():
+        last = {topic: analytics.get_version(topic) for topic in _STREAM_TOPICS}
+        idle = 0.0
+        yield b"retry: 5000\n\n"
+        while not await request.is_disconnected():
+            await asyncio.sleep(_STREAM_POLL_SECONDS)
+            idle += _STREAM_POLL_SECONDS
+            for topic in _STREAM_TOPICS:
+                version = analytics.get_version(topic)
+                if version != last[topic]:
+                    last[topic] = version
+                    idle = 0.0
+                    yield f"event: {topic}\ndata: {analytics.instance_id}-{version}\n\n".encode()
+            if idle >= _STREAM_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield b": keepalive\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/api/signals")
 async def get_signals(
     request: Request,
+    response: Response,
     limit: int = 50,
     account_id: Optional[str] = None,
+    analytics=Depends(get_analytics),
 ) -> Dict[str, Any]:
     """Get recent signals."""
-    analytics = _get_analytics(request)
+
+    etag = f'W/"signals-{analytics.instance_id}-{analytics.get_version("signals")}-{limit}-{account_id or "_"}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
 
     signals = analytics.list_signals(
         account_id=account_id,
         limit=limit,
     )
 
-    for signal in signals:
-        raw_payload = signal.get("raw_payload") or "{}"
-        try:
-            payload = json.loads(raw_payload)
-        except Exception:
-            payload = {}
-        signal["signal_type"] = payload.get("signal_type")
-        signal["timeframe"] = payload.get("timeframe")
-
     return {"signals": signals}
 
 
 @router.get("/api/assets")
-async def get_assets(request: Request) -> Dict[str, Any]:
+async def get_assets(
+    request: Request,
+    manager=Depends(get_account_manager),
+) -> Dict[str, Any]:
     """Get configured assets for dashboard tabs."""
-    manager = _get_account_manager(request)
     config = getattr(request.app.state, "config", {})
     dashboard_cfg = config.get("dashboard", {}) if isinstance(config, dict) else {}
     assets = []
@@ -1186,43 +649,83 @@ async def get_balances(
     request: Request,
     account_id: str,
     baseline_iso: Optional[str] = None,
+    analytics=Depends(get_analytics),
+    manager=Depends(get_account_manager),
 ) -> Dict[str, Any]:
     """Get token balances for an account with USD values."""
-    analytics = _get_analytics(request)
-    manager = _get_account_manager(request)
     
     account = manager.get_account(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    # Get token configuration
-    config = getattr(request.app.state, "config", {})
-    tokens = config.get("tokens", {})
-    
     # Get Jupiter and Solana clients
     jupiter = getattr(request.app.state, "jupiter", None)
     solana = getattr(request.app.state, "solana", None)
     
     if not jupiter or not solana:
         raise HTTPException(status_code=500, detail="Clients not initialized")
-    
+
+    if baseline_iso:
+        try:
+            parsed_baseline = _parse_baseline_iso(baseline_iso)
+            baseline_anchor_iso = (
+                parsed_baseline
+                if parsed_baseline
+                else datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid baseline_iso format")
+    else:
+        baseline_anchor_iso = None
+
+    # A recent result for the same account/baseline is answered (or 304'd) without
+    # repeating the RPC and price fan-out or the snapshot write.
+    key = (account_id, baseline_anchor_iso)
+    cache = getattr(request.app.state, "balance_cache", None)
+    if cache is None:
+        cache = request.app.state.balance_cache = {}
+    now = time.monotonic()
+    cached = cache.get(key)
+    if cached and now - cached[0] < _BALANCE_CACHE_TTL:
+        return _etag_body_response(request, cached[2], cached[1])
+
+    # Concurrent pollers for the same account/baseline share one RPC fan-out.
+    result = await _BALANCE_FLIGHTS.run(
+        key,
+        lambda: _compute_balances(request, analytics, account, jupiter, solana, baseline_anchor_iso),
+    )
+    body, etag = _json_etag_body(result)
+    now = time.monotonic()
+    for stale_key in [k for k, entry in cache.items() if now - entry[0] >= _BALANCE_CACHE_TTL]:
+        del cache[stale_key]
+    cache[key] = (now, etag, body)
+    return _etag_body_response(request, body, etag)
+
+
+async def _compute_balances(
+    request: Request,
+    analytics,
+    account,
+    jupiter,
+    solana,
+    baseline_anchor_iso: Optional[str],
+) -> Dict[str, Any]:
+    """Fetch balances, prices and baseline changes for one account."""
+    account_id = account.id
+
+    # Get token configuration
+    config = getattr(request.app.state, "config", {})
+    tokens = config.get("tokens", {})
+
     balances = []
-    symbol_by_mint = {mint: symbol for symbol, mint in tokens.items() if mint}
-    symbol_overrides = {
-        "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB": "USDT",
-        "BFgdzMkTPdKKJeTipv2njtDEwhKxkgFueJQfJGt1jups": "URANUS",
-        "pumpCmXqMfrsAkQ5r49WcJnRayYRqmXz6ae8H7H9Dfn": "PUMP",
-    }
+    symbol_by_mint = getattr(request.app.state, "symbol_by_mint", None)
+    if symbol_by_mint is None:
+        symbol_by_mint = {mint: symbol for symbol, mint in tokens.items() if mint}
+        request.app.state.symbol_by_mint = symbol_by_mint
 
     # Get SOL balance
-    from solders.pubkey import Pubkey
-    from spl.token.constants import TOKEN_PROGRAM_ID
-    try:
-        from spl.token_2022.constants import TOKEN_2022_PROGRAM_ID
-    except Exception:
-        TOKEN_2022_PROGRAM_ID = None
-
     wallet_pubkey = account.keypair.pubkey()
+    wallet_address = account.address
     try:
         sol_balance_resp = await solana.get_balance(wallet_pubkey)
         sol_balance = sol_balance_resp / 1e9 if sol_balance_resp else 0
@@ -1238,104 +741,96 @@ async def get_balances(
 
     # Get all SPL token balances (non-zero)
     mint_balances: Dict[str, float] = {}
-    program_ids = [str(TOKEN_PROGRAM_ID)]
-    if TOKEN_2022_PROGRAM_ID:
-        program_ids.append(str(TOKEN_2022_PROGRAM_ID))
-    else:
-        # Fallback Token-2022 program id for environments without spl.token_2022
-        program_ids.append("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
 
     rpc_url = getattr(solana, "rpc_url", None) or config.get("solana", {}).get("rpc_url")
-    if rpc_url:
+    client = getattr(request.app.state, "http_client", None)
+    if rpc_url and client is not None:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                for program_id in program_ids:
-                    payload = {
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "getTokenAccountsByOwner",
-                        "params": [
-                            str(wallet_pubkey),
-                            {"programId": program_id},
-                            {"encoding": "jsonParsed"},
-                        ],
-                    }
-                    resp = await client.post(rpc_url, json=payload)
-                    data = resp.json()
-                    if data.get("error"):
-                        logger.error("Failed to list token balances: {}", data["error"])
+            async def _list_token_accounts(program_id: str) -> Dict[str, Any]:
+                payload = {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getTokenAccountsByOwner",
+                    "params": [
+                        wallet_address,
+                        {"programId": program_id},
+                        {"encoding": "jsonParsed"},
+                    ],
+                }
+                resp = await client.post(rpc_url, json=payload)
+                return orjson.loads(resp.content)
+
+            # Both token programs are queried at once rather than back to back.
+            responses = await asyncio.gather(
+                *(_list_token_accounts(program_id) for program_id in _TOKEN_PROGRAM_IDS)
+            )
+            for data in responses:
+                if data.get("error"):
+                    logger.error("Failed to list token balances: {}", data["error"])
+                    continue
+                for item in (data.get("result", {}) or {}).get("value", []):
+                    info = (((item.get("account") or {}).get("data") or {}).get("parsed") or {}).get("info") or {}
+                    mint = info.get("mint")
+                    token_amount = info.get("tokenAmount") or {}
+                    ui_amount = token_amount.get("uiAmount")
+                    ui_amount_str = token_amount.get("uiAmountString")
+                    if ui_amount is None or (ui_amount == 0 and ui_amount_str not in (None, "", "0", "0.0")):
+                        try:
+                            ui_amount = float(ui_amount_str or 0)
+                        except Exception:
+                            ui_amount = 0
+                    if not mint or not ui_amount or ui_amount <= 0:
                         continue
-                    for item in (data.get("result", {}) or {}).get("value", []):
-                        info = (((item.get("account") or {}).get("data") or {}).get("parsed") or {}).get("info") or {}
-                        mint = info.get("mint")
-                        token_amount = info.get("tokenAmount") or {}
-                        ui_amount = token_amount.get("uiAmount")
-                        ui_amount_str = token_amount.get("uiAmountString")
-                        if ui_amount is None or (ui_amount == 0 and ui_amount_str not in (None, "", "0", "0.0")):
-                            try:
-                                ui_amount = float(ui_amount_str or 0)
-                            except Exception:
-                                ui_amount = 0
-                        if not mint or not ui_amount or ui_amount <= 0:
-                            continue
-                        mint_balances[mint] = mint_balances.get(mint, 0) + float(ui_amount)
+                    mint_balances[mint] = mint_balances.get(mint, 0) + float(ui_amount)
         except Exception as e:
             logger.error("Failed to list token balances: {}", e)
-    else:
+    elif not rpc_url:
         logger.warning("Solana RPC URL not configured; skipping token balances")
+    else:
+        logger.warning("HTTP client not initialized; skipping token balances")
+
+    # Metadata and USD prices (API key configured) are independent lookups.
+    token_mints = [b["mint"] for b in balances]
+    token_mints.extend(mint_balances)
+
+    async def _fetch_prices() -> Dict[str, float]:
+        # JupiterClient caches recent prices, so frequent polls stay cheap.
+        try:
+            return await jupiter.get_token_price(token_mints) or {}
+        except Exception as e:
+            logger.error("Failed to get token prices: {}", str(e))
+            return {}
 
-    token_metadata = await _get_token_metadata(request, list(mint_balances.keys()))
+    token_metadata, prices = await asyncio.gather(
+        _get_token_metadata(request, list(mint_balances)),
+        _fetch_prices(),
+    )
 
     for mint, balance in mint_balances.items():
-        if balance <= 0:
-            continue
         meta = token_metadata.get(mint, {})
         symbol = (
             meta.get("symbol")
-            or symbol_overrides.get(mint)
+            or _SYMBOL_OVERRIDES.get(mint)
             or symbol_by_mint.get(mint)
             or f"{mint[:4]}...{mint[-4:]}"
         )
-        name = meta.get("name")
         balances.append({
             "token": symbol,
-            "name": name,
+            "name": meta.get("name"),
             "balance": balance,
             "mint": mint,
         })
 
-    # Get USD prices from Jupiter (API key configured)
-    token_mints = [b["mint"] for b in balances]
-    prices = {}
-
-    try:
-        price_data = await jupiter.get_token_price(token_mints)
-        if price_data:
-            prices = price_data
-    except Exception as e:
-        logger.error("Failed to get token prices: {}", str(e))
-    
     # Add USD values
     total_usd = 0
     for balance in balances:
-        mint = balance["mint"]
-        price = prices.get(mint, 0)
+        price = prices.get(balance["mint"], 0)
         usd_value = balance["balance"] * price
         balance["price_usd"] = price
         balance["value_usd"] = usd_value
         total_usd += usd_value
 
-    if baseline_iso:
-        try:
-            parsed_baseline = _parse_baseline_iso(baseline_iso)
-            baseline_anchor_iso = (
-                parsed_baseline
-                if parsed_baseline
-                else datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-            )
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid baseline_iso format")
-    else:
+    if not baseline_anchor_iso:
         baseline_anchor_iso = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
     # Persist every balance fetch so baseline calculations survive restarts.
@@ -1350,32 +845,26 @@ async def get_balances(
     )
 
     for balance in balances:
-        mint = balance["mint"]
-        baseline_entry = baseline_by_mint.get(mint)
+        amount = balance["balance"]
+        value_usd = balance["value_usd"]
+        baseline_entry = baseline_by_mint.get(balance["mint"])
         if baseline_entry is None:
-            baseline_entry = {
-                "balance": balance["balance"],
-                "usd": balance["value_usd"],
-            }
-
-        base_balance = baseline_entry.get("balance", 0)
-        base_usd = baseline_entry.get("usd", 0)
+            base_balance, base_usd = amount, value_usd
+        else:
+            base_balance = baseline_entry.get("balance", 0)
+            base_usd = baseline_entry.get("usd", 0)
 
-        change_amount = balance["balance"] - base_balance
-        balance["change_amount"] = change_amount
-        change_usd = balance["value_usd"] - base_usd
+        change_usd = value_usd - base_usd
+        balance["change_amount"] = amount - base_balance
         balance["change_usd"] = change_usd
 
         # "Change" represents overall USD value change from the selected baseline.
-        if base_usd and base_usd != 0:
-            balance["change_pct"] = (change_usd / base_usd) * 100
-        else:
-            balance["change_pct"] = None
+        balance["change_pct"] = (change_usd / base_usd) * 100 if base_usd else None
     
     return {
         "account_id": account_id,
         "account_label": account.label,
-        "wallet_address": str(wallet_pubkey),
+        "wallet_address": wallet_address,
         "balances": balances,
         "total_usd": total_usd,
         "baseline_iso": baseline_anchor_iso,
@@ -1,5 +1,9 @@
 """Signal routing to wallet accounts."""
-from typing import TYPE_CHECKING, Dict, Tuple, Any
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any
 from loguru import logger
 
 from models.schemas import Signal
@@ -7,25 +11,111 @@ from models.schemas import Signal
 if TYPE_CHECKING:
     from services.account_manager import AccountManager
     from services.analytics_store import AnalyticsStore
+    from services.analytics_writer import AnalyticsWriter
+
+
+# Half-finished MR-Low/Mean sequences are bounded in count and age.
+_SEQUENCE_STATE_MAX = 4096
+_SEQUENCE_STATE_TTL = 24 * 3600.0
+
+
+# Sequence stage used for a stored state whose action differs from the signal's.
+_OPPOSITE = "opposite"
+
+_MR_LOW_WAITING = "[{account}] MR-Low received; waiting for Mean ({action})"
+_MEAN_WAITING = "[{account}] Mean received; waiting for Conf/Trend ({action})"
+
+# (current stage, signal type) -> (next stage, execute, log messages).
+# A next stage of None leaves the state untouched; executing clears it.
+_SEQUENCE_TRANSITIONS: Dict[Tuple[Optional[str], str], Tuple[Optional[str], bool, Tuple[str, ...]]] = {
+    (None, "mr-low"): ("mr_low", False, (_MR_LOW_WAITING,)),
+    (_OPPOSITE, "mr-low"): ("mr_low", False, (
+        "[{account}] MR-Low opposite direction; resetting sequence for {symbol}",
+        _MR_LOW_WAITING,
+    )),
+    ("mr_low", "mr-low"): ("mr_low", False, (
+        "[{account}] MR-Low received; starting sequence for {action}",
+        _MR_LOW_WAITING,
+    )),
+    # Keep existing stage (do not downgrade mean)
+    ("mean", "mr-low"): ("mean", False, (
+        "[{account}] MR-Low received; sequence already armed for {action}",
+        _MR_LOW_WAITING,
+    )),
+    ("mr_low", "mean"): ("mean", False, (_MEAN_WAITING,)),
+    ("mean", "mean"): ("mean", False, (_MEAN_WAITING,)),
+    ("mean", "conf"): (None, True, ("[{account}] {signal_type} received; sequence complete for {symbol}",)),
+    ("mean", "trend"): (None, True, ("[{account}] {signal_type} received; sequence complete for {symbol}",)),
+}
+
+# Fallback transition per signal type when no sequence matches.
+_SEQUENCE_IGNORED: Dict[str, Tuple[Optional[str], bool, Tuple[str, ...]]] = {
+    "mr-low": (None, False, ()),
+    "mean": (None, False, ("[{account}] Mean ignored; no MR-Low sequence for {action} {symbol}",)),
+    "conf": (None, False, ("[{account}] {signal_type} ignored; sequence incomplete for {action} {symbol}",)),
+    "trend": (None, False, ("[{account}] {signal_type} ignored; sequence incomplete for {action} {symbol}",)),
+}
+_SEQUENCE_SIGNAL_TYPES = frozenset(_SEQUENCE_IGNORED)
+
+
+_SIGNAL_TYPE_TABLE = str.maketrans({"_": "-", " ": "-"})
+_SIGNAL_TYPE_SYNONYMS = {"mr-0.5": "mr-low", "mrlow": "mr-low"}
+
+
+@lru_cache(maxsize=64)
+def _normalize_signal_type(signal_type: str) -> str:
+    """Normalize a signal type label (e.g. "MR_Low", "mr 0.5") to its canonical form."""
+    normalized = signal_type.strip().lower().translate(_SIGNAL_TYPE_TABLE)
+    return _SIGNAL_TYPE_SYNONYMS.get(normalized, normalized)
 
 
 class SignalRouter:
     """Routes trading signals to appropriate wallet accounts."""
 
-    def __init__(self, account_manager: "AccountManager", analytics: "AnalyticsStore"):
+    __slots__ = (
+        "account_manager",
+        "analytics",
+        "recorder",
+        "sequence_state",
+    )
+
+    def __init__(
+        self,
+        account_manager: "AccountManager",
+        analytics: "AnalyticsStore",
+        writer: Optional["AnalyticsWriter"] = None,
+    ):
         self.account_manager = account_manager
         self.analytics = analytics
-        self.sequence_state: Dict[Tuple[str, str], Dict[str, Any]] = {}
-
-    def _normalize_signal_type(self, signal_type: str) -> str:
-        normalized = str(signal_type).strip().lower()
-        normalized = normalized.replace("_", "-").replace(" ", "-")
-        if normalized in {"mr-0.5", "mrlow"}:
-            return "mr-low"
-        return normalized
-
-    def _should_execute_sequence(self, account_id: str, signal: Signal) -> bool:
-        signal_type = signal.metadata.get("signal_type")
+        # Signal records go through the batching writer when one is provided.
+        self.recorder = writer or analytics
+        # (account_id, symbol) -> (monotonic timestamp, stage, action), least recently used first
+        self.sequence_state: "OrderedDict[Tuple[str, str], Tuple[float, str, str]]" = OrderedDict()
+
+    def _get_state(self, key: Tuple[str, str]) -> Optional[Tuple[float, str, str]]:
+        entry = self.sequence_state.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _SEQUENCE_STATE_TTL:
+            del self.sequence_state[key]
+            logger.debug("[{}] Expired {} sequence for {}", key[0], entry[1], key[1])
+            return None
+        self.sequence_state.move_to_end(key)
+        return entry
+
+    def _set_state(self, key: Tuple[str, str], stage: str, action: str) -> None:
+        self.sequence_state[key] = (time.monotonic(), stage, action)
+        self.sequence_state.move_to_end(key)
+        if len(self.sequence_state) > _SEQUENCE_STATE_MAX:
+            (account_id, symbol), (_, evicted_stage, _) = self.sequence_state.popitem(last=False)
+            logger.debug("[{}] Evicted {} sequence for {}", account_id, evicted_stage, symbol)
+
+    def _should_execute_sequence(
+        self,
+        account_id: str,
+        signal: Signal,
+        signal_type: Optional[str],
+    ) -> bool:
         if not signal_type:
             logger.info(
                 "[{}] Missing signal_type metadata; ignoring legacy signal",
@@ -33,87 +123,40 @@ class SignalRouter:
             )
             return False
 
-        signal_type = self._normalize_signal_type(signal_type)
-        key = (account_id, signal.symbol)
-        state = self.sequence_state.get(key)
-
-        if signal_type == "mr-low":
-            if state and state.get("action") != signal.action:
-                logger.info(
-                    "[{}] MR-Low opposite direction; resetting sequence for {}",
-                    account_id,
-                    signal.symbol,
-                )
-                self.sequence_state[key] = {"stage": "mr_low", "action": signal.action}
-            elif state and state.get("action") == signal.action:
-                if state.get("stage") == "mean":
-                    logger.info(
-                        "[{}] MR-Low received; sequence already armed for {}",
-                        account_id,
-                        signal.action,
-                    )
-                else:
-                    logger.info(
-                        "[{}] MR-Low received; starting sequence for {}",
-                        account_id,
-                        signal.action,
-                    )
-                # Keep existing stage (do not downgrade mean)
-                self.sequence_state[key] = {
-                    "stage": state.get("stage", "mr_low"),
-                    "action": signal.action,
-                }
-            else:
-                self.sequence_state[key] = {"stage": "mr_low", "action": signal.action}
+        if signal_type not in _SEQUENCE_SIGNAL_TYPES:
             logger.info(
-                "[{}] MR-Low received; waiting for Mean ({})",
+                "[{}] Unrecognized signal type {}; ignoring",
                 account_id,
-                signal.action,
+                signal_type,
             )
             return False
 
-        if signal_type == "mean":
-            if not state or state.get("action") != signal.action:
-                logger.info(
-                    "[{}] Mean ignored; no MR-Low sequence for {} {}",
-                    account_id,
-                    signal.action,
-                    signal.symbol,
-                )
-                return False
-            state["stage"] = "mean"
-            logger.info(
-                "[{}] Mean received; waiting for Conf/Trend ({})",
-                account_id,
-                signal.action,
-            )
-            return False
+        key = (account_id, signal.symbol)
+        state = self._get_state(key)
+        if state is None:
+            stage = None
+        elif state[2] == signal.action:
+            stage = state[1]
+        else:
+            stage = _OPPOSITE
 
-        if signal_type in {"conf", "trend"}:
-            if state and state.get("stage") == "mean" and state.get("action") == signal.action:
-                self.sequence_state.pop(key, None)
-                logger.info(
-                    "[{}] {} received; sequence complete for {}",
-                    account_id,
-                    signal_type,
-                    signal.symbol,
-                )
-                return True
+        next_stage, execute, messages = _SEQUENCE_TRANSITIONS.get(
+            (stage, signal_type), _SEQUENCE_IGNORED[signal_type]
+        )
+        if execute:
+            self.sequence_state.pop(key, None)
+        elif next_stage is not None:
+            self._set_state(key, next_stage, signal.action)
+
+        for message in messages:
             logger.info(
-                "[{}] {} ignored; sequence incomplete for {} {}",
-                account_id,
-                signal_type,
-                signal.action,
-                signal.symbol,
+                message,
+                account=account_id,
+                action=signal.action,
+                symbol=signal.symbol,
+                signal_type=signal_type,
             )
-            return False
-
-        logger.info(
-            "[{}] Unrecognized signal type {}; ignoring",
-            account_id,
-            signal_type,
-        )
-        return False
+        return execute
 
     async def handle(self, signal: Signal) -> None:
         """
@@ -130,45 +173,47 @@ class SignalRouter:
             signal.metadata.get("timeframe") or "-",
         )
 
-        # Route to matching accounts
+        raw_type = signal.metadata.get("signal_type")
+        signal_type = _normalize_signal_type(str(raw_type)) if raw_type else None
+
+        # Route to matching accounts; sequence state is updated serially here
+        # and only the resulting swaps run concurrently.
         routed = 0
-        for account in self.account_manager.accounts.values():
-            if not account.enabled:
-                continue
-
-            # Check if account trades this symbol
-            strategy = account.strategy
-            token_pair = strategy.get("token_pair", "")
-            base_token = strategy.get("base_token", "")
-            quote_token = strategy.get("quote_token", "")
-
-            matches_pair = token_pair and token_pair == signal.symbol
-            matches_token = quote_token and quote_token == signal.symbol
-            matches_base = base_token and base_token == signal.symbol
-            if matches_pair or matches_token or matches_base:
-                routed_symbol = token_pair or (
-                    f"{quote_token}-{base_token}" if quote_token and base_token else signal.symbol
-                )
+        pending: List[Tuple[Any, Signal]] = []
+        for account in self.account_manager.accounts_for_symbol(signal.symbol):
+            routed_symbol = account.routed_symbol
+            if not routed_symbol or routed_symbol == signal.symbol:
+                routed_signal = signal
+            else:
                 routed_signal = signal.copy(update={"symbol": routed_symbol})
 
-                # Record signal per account using routed symbol
-                self.analytics.record_signal(
-                    action=routed_signal.action,
-                    symbol=routed_signal.symbol,
-                    account_id=account.id,
-                    amount=routed_signal.amount,
-                    price=routed_signal.price,
-                    note=routed_signal.note,
-                    payload=routed_signal.metadata,
-                )
-
-                if self._should_execute_sequence(account.id, routed_signal):
-                    await account.swap_engine.process_signal(routed_signal)
-                routed += 1
+            # Record signal per account using routed symbol
+            self.recorder.record_signal(
+                action=routed_signal.action,
+                symbol=routed_signal.symbol,
+                account_id=account.id,
+                amount=routed_signal.amount,
+                price=routed_signal.price,
+                note=routed_signal.note,
+                payload=routed_signal.metadata,
+            )
+
+            if self._should_execute_sequence(account.id, routed_signal, signal_type):
+                pending.append((account, routed_signal))
+            routed += 1
+
+        if pending:
+            results = await asyncio.gather(
+                *(account.swap_engine.process_signal(routed_signal) for account, routed_signal in pending),
+                return_exceptions=True,
+            )
+            for (account, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    logger.error("[{}] Signal processing failed: {}", account.id, result)
 
         if routed == 0:
             # Record unmatched signal once for visibility
-            self.analytics.record_signal(
+            self.recorder.record_signal(
                 action=signal.action,
                 symbol=signal.symbol,
                 amount=signal.amount,
@@ -1,5 +1,5 @@
 """Swap strategy engine for processing signals."""
-from datetime import datetime, timedelta
+import time
 from typing import TYPE_CHECKING, Dict, Any, Optional
 from loguru import logger
 from solders.pubkey import Pubkey
@@ -13,6 +13,30 @@ if TYPE_CHECKING:
 class SwapEngine:
     """Processes trading signals and triggers swaps."""
 
+    __slots__ = (
+        "account_id",
+        "account_label",
+        "strategy",
+        "_slippage_bps",
+        "_default_size",
+        "_cooldown_s",
+        "_skr_threshold",
+        "_sol_reserve",
+        "_base_reserve",
+        "_base_token",
+        "_quote_token",
+        "analytics",
+        "swap_manager",
+        "solana_client",
+        "keypair",
+        "token_config",
+        "_owner_pubkey",
+        "_mint_pubkeys",
+        "last_swap_time",
+        "last_action",
+        "last_swap_output_amount",
+    )
+
     def __init__(
         self,
         account_id: str,
@@ -27,12 +51,29 @@ class SwapEngine:
         self.account_id = account_id
         self.account_label = account_label
         self.strategy = strategy
+        # Strategy settings resolved once; the strategy dict does not change at runtime.
+        self._slippage_bps = strategy.get("max_slippage_bps", 100)
+        self._default_size = strategy.get("default_swap_size", 0.1)
+        self._cooldown_s = strategy.get("min_time_between_swaps", 30)
+        self._skr_threshold = strategy.get("min_skr_threshold", 0.1)  # Minimum SKR to consider "holding"
+        self._sol_reserve = strategy.get("min_sol_reserve", 0.01)
+        self._base_reserve = strategy.get("min_base_reserve", 0)
+        self._base_token = strategy.get("base_token", "SOL")
+        self._quote_token = strategy.get("quote_token", "SKR")
         self.analytics = analytics
         self.swap_manager = swap_manager
         self.solana_client = solana_client
         self.keypair = keypair
         self.token_config = token_config or {}
-        self.last_swap_time: Dict[str, datetime] = {}
+        # Parsed once; balance and decimals lookups take Pubkeys.
+        self._owner_pubkey = keypair.pubkey() if keypair else None
+        self._mint_pubkeys: Dict[str, Pubkey] = {}
+        for symbol, mint in self.token_config.items():
+            try:
+                self._mint_pubkeys[symbol] = Pubkey.from_string(mint)
+            except Exception as e:
+                logger.warning("[{}] Invalid {} mint {}: {}", account_id, symbol, mint, e)
+        self.last_swap_time: Dict[str, float] = {}  # symbol -> monotonic time of last swap
         self.last_action: Optional[str] = None
         self.last_swap_output_amount: Optional[float] = None  # Track base token from SELL
 
@@ -75,8 +116,21 @@ class SwapEngine:
             )
             return
 
+        # Reject signals that cannot produce a swap before making any RPC
+        reason = self._preflight(signal)
+        if reason:
+            logger.warning("[{}] Skipping {}: {}", self.account_id, signal.action, reason)
+            return
+
+        # Fetch balances once for both the position check and swap sizing
+        try:
+            balances = await self._fetch_balances(signal.action)
+        except Exception as e:
+            logger.error("[{}] Failed to fetch balances: {}", self.account_id, e)
+            return
+
         # Check position before executing (arbitrage strategy)
-        if not await self._check_position(signal.action):
+        if not await self._check_position(signal.action, balances):
             logger.info(
                 "[{}] Skipping {} - position check failed",
                 self.account_id,
@@ -84,14 +138,11 @@ class SwapEngine:
             )
             return
 
-        # Determine swap direction
+        # Determine swap direction (validated by _preflight)
         input_token, output_token = self._get_swap_tokens(signal)
-        if not input_token or not output_token:
-            logger.warning("[{}] Could not determine swap tokens", self.account_id)
-            return
 
         # Get swap amount based on action
-        amount = await self._get_swap_amount(signal.action, input_token, signal.amount)
+        amount = await self._get_swap_amount(signal.action, input_token, signal.amount, balances)
         if amount is None or amount <= 0:
             logger.warning(
                 "[{}] Invalid or zero swap amount for {} {}",
@@ -101,7 +152,7 @@ class SwapEngine:
             )
             return
 
-        slippage_bps = self.strategy.get("max_slippage_bps", 100)
+        slippage_bps = self._slippage_bps
 
         # Create swap request
         swap_request = SwapRequest(
@@ -127,24 +178,23 @@ class SwapEngine:
 
         if result.success:
             logger.info(
-                "[{}] Swap successful: {} {} (sig: {})",
+                "[{}] Swap successful: {} {} (sig: {:.16})",
                 self.account_id,
                 result.output_amount,
                 output_token,
-                result.signature[:16] if result.signature else "?"
+                result.signature or "?"
             )
-            self.last_swap_time[signal.symbol] = datetime.utcnow()
+            self.last_swap_time[signal.symbol] = time.monotonic()
             # Update last action after successful swap
             self.last_action = signal.action
             # Save output amount if this was a SELL (to use for next BUY)
             if signal.action == "SELL":
                 self.last_swap_output_amount = result.output_amount
-                base_token = self.strategy.get("base_token", "SOL")
                 logger.info(
                     "[{}] Saved {} {} for next BUY",
                     self.account_id,
                     result.output_amount,
-                    base_token
+                    self._base_token
                 )
         else:
             logger.error(
@@ -153,7 +203,42 @@ class SwapEngine:
                 result.error
             )
 
-    async def _check_position(self, action: str) -> bool:
+    async def _fetch_balances(self, action: str) -> Dict[str, Optional[int]]:
+        """
+        Fetch the raw balances needed to check position and size a swap.
+
+        SOL and SKR are always read; BUY also reads the base token when it is
+        an SPL token. Everything comes back from a single getMultipleAccounts.
+
+        Args:
+            action: BUY or SELL
+
+        Returns:
+            Token symbol -> balance in base units (None if the lookup failed)
+        """
+        if not self.solana_client or not self.keypair:
+            return {}
+
+        mint_pubkeys = self._mint_pubkeys
+        tokens = ["SKR"] if "SKR" in mint_pubkeys else []
+        if action == "BUY":
+            base_token = self._base_token
+            if base_token != "SOL" and base_token in mint_pubkeys and base_token not in tokens:
+                tokens.append(base_token)
+
+        result = await self.solana_client.get_multiple_balances(
+            self._owner_pubkey,
+            [mint_pubkeys[token] for token in tokens],
+        )
+        if result is None:
+            return {"SOL": None, **{token: None for token in tokens}}
+
+        lamports, amounts = result
+        balances: Dict[str, Optional[int]] = dict(zip(tokens, amounts))
+        balances["SOL"] = lamports
+        return balances
+
+    async def _check_position(self, action: str, balances: Dict[str, Optional[int]]) -> bool:
         """
         Check if we should execute this action based on current holdings.
 
@@ -163,6 +248,7 @@ class SwapEngine:
 
         Args:
             action: BUY or SELL
+            balances: Prefetched balances from _fetch_balances
 
         Returns:
             True if position check passes, False otherwise
@@ -171,24 +257,21 @@ class SwapEngine:
             logger.warning("[{}] Cannot check position: missing client/keypair", self.account_id)
             return True  # Allow trade if we can't check
 
-        skr_mint = self.token_config.get("SKR")
-        if not skr_mint:
+        skr_mint = self._mint_pubkeys.get("SKR")
+        if skr_mint is None:
             logger.warning("[{}] SKR mint not configured", self.account_id)
             return True  # Allow trade if SKR not configured
 
         try:
-            # Get current SKR balance
-            balance = await self.solana_client.get_token_balance(
-                Pubkey.from_string(str(self.keypair.pubkey())),
-                Pubkey.from_string(skr_mint)
-            )
+            # Current SKR balance
+            balance = balances.get("SKR")
 
             decimals = await self._get_token_decimals(skr_mint, default=6)
             # Convert from base units to tokens
             skr_balance = (balance / (10 ** decimals)) if balance else 0
-            min_threshold = self.strategy.get("min_skr_threshold", 0.1)  # Minimum SKR to consider "holding"
+            min_threshold = self._skr_threshold
 
-            logger.info(
+            logger.debug(
                 "[{}] Current SKR balance: {} (threshold: {})",
                 self.account_id,
                 skr_balance,
@@ -205,7 +288,7 @@ class SwapEngine:
                         min_threshold
                     )
                     return False
-                logger.info("[{}] BUY approved - SKR balance below threshold", self.account_id)
+                logger.debug("[{}] BUY approved - SKR balance below threshold", self.account_id)
                 return True
 
             elif action == "SELL":
@@ -218,7 +301,7 @@ class SwapEngine:
                         min_threshold
                     )
                     return False
-                logger.info("[{}] SELL approved - have {} SKR to sell", self.account_id, skr_balance)
+                logger.debug("[{}] SELL approved - have {} SKR to sell", self.account_id, skr_balance)
                 return True
 
             return True
@@ -227,7 +310,13 @@ class SwapEngine:
             logger.error("[{}] Failed to check position: {}", self.account_id, e)
             return False  # Don't trade if we can't verify position
 
-    async def _get_swap_amount(self, action: str, token: str, signal_amount: Optional[float]) -> Optional[float]:
+    async def _get_swap_amount(
+        self,
+        action: str,
+        token: str,
+        signal_amount: Optional[float],
+        balances: Dict[str, Optional[int]],
+    ) -> Optional[float]:
         """
         Get the amount to swap based on action.
 
@@ -237,13 +326,15 @@ class SwapEngine:
         Args:
             action: BUY or SELL
             token: Token symbol to swap
+            signal_amount: Amount requested by the signal (ignored)
+            balances: Prefetched balances from _fetch_balances
 
         Returns:
             Amount to swap or None if error
         """
         if action == "SELL":
             if signal_amount is not None:
-                logger.info(
+                logger.debug(
                     "[{}] Ignoring signal amount for SELL; using full SKR balance",
                     self.account_id
                 )
@@ -251,19 +342,16 @@ class SwapEngine:
             # Use entire SKR balance
             if not self.solana_client or not self.keypair:
                 logger.warning("[{}] Cannot get balance: missing client/keypair", self.account_id)
-                return self.strategy.get("default_swap_size", 0.1)
+                return self._default_size
 
-            skr_mint = self.token_config.get("SKR")
-            if not skr_mint:
+            skr_mint = self._mint_pubkeys.get("SKR")
+            if skr_mint is None:
                 logger.warning("[{}] SKR mint not configured", self.account_id)
-                return self.strategy.get("default_swap_size", 0.1)
+                return self._default_size
 
             try:
-                balance = await self.solana_client.get_token_balance(
-                    Pubkey.from_string(str(self.keypair.pubkey())),
-                    Pubkey.from_string(skr_mint)
-                )
-                
+                balance = balances.get("SKR")
+
                 if balance is None or balance == 0:
                     logger.warning("[{}] No SKR balance to sell", self.account_id)
                     return None
@@ -271,44 +359,43 @@ class SwapEngine:
                 decimals = await self._get_token_decimals(skr_mint, default=6)
                 # Convert from base units to tokens
                 amount = balance / (10 ** decimals)
-                logger.info("[{}] Using entire SKR balance: {}", self.account_id, amount)
+                logger.debug("[{}] Using entire SKR balance: {}", self.account_id, amount)
                 return amount
 
             except Exception as e:
                 logger.error("[{}] Failed to get SKR balance: {}", self.account_id, e)
-                return self.strategy.get("default_swap_size", 0.1)
+                return self._default_size
 
         elif action == "BUY":
             if signal_amount is not None:
-                logger.info(
+                logger.debug(
                     "[{}] Ignoring signal amount for BUY; using full base token balance",
                     self.account_id
                 )
 
-            base_token = self.strategy.get("base_token", "SOL")
+            base_token = self._base_token
+            default_size = self._default_size
 
             # Check available balance for base token
             if not self.solana_client or not self.keypair:
                 logger.warning("[{}] Cannot check {} balance: missing client/keypair", self.account_id, base_token)
-                return target_amount
+                return default_size
 
             if base_token == "SOL":
                 try:
-                    sol_balance = await self.solana_client.get_balance(
-                        Pubkey.from_string(str(self.keypair.pubkey()))
-                    )
+                    sol_balance = balances.get("SOL")
 
                     if sol_balance is None:
                         logger.warning("[{}] Failed to get SOL balance", self.account_id)
-                        return target_amount
+                        return default_size
 
                     # Convert lamports to SOL
                     sol_balance_tokens = sol_balance / 1e9
                     # Reserve for fees
-                    min_reserve = self.strategy.get("min_sol_reserve", 0.01)
+                    min_reserve = self._sol_reserve
                     available_sol = sol_balance_tokens - min_reserve
 
-                    logger.info(
+                    logger.debug(
                         "[{}] SOL balance: {} (available: {} after {} reserve)",
                         self.account_id,
                         sol_balance_tokens,
@@ -320,7 +407,7 @@ class SwapEngine:
                         logger.warning("[{}] Insufficient SOL balance for swap", self.account_id)
                         return None
 
-                    logger.info(
+                    logger.debug(
                         "[{}] Using entire SOL balance: {}",
                         self.account_id,
                         available_sol
@@ -329,29 +416,26 @@ class SwapEngine:
 
                 except Exception as e:
                     logger.error("[{}] Failed to check SOL balance: {}", self.account_id, e)
-                    return target_amount
+                    return default_size
 
-            base_mint = self.token_config.get(base_token)
-            if not base_mint:
+            base_mint = self._mint_pubkeys.get(base_token)
+            if base_mint is None:
                 logger.warning("[{}] {} mint not configured", self.account_id, base_token)
-                return target_amount
+                return default_size
 
             try:
-                base_balance = await self.solana_client.get_token_balance(
-                    Pubkey.from_string(str(self.keypair.pubkey())),
-                    Pubkey.from_string(base_mint)
-                )
+                base_balance = balances.get(base_token)
 
                 if base_balance is None:
                     logger.warning("[{}] Failed to get {} balance", self.account_id, base_token)
-                    return target_amount
+                    return default_size
 
                 decimals = await self._get_token_decimals(base_mint, default=6)
                 base_balance_tokens = base_balance / (10 ** decimals)
-                min_reserve = self.strategy.get("min_base_reserve", 0)
+                min_reserve = self._base_reserve
                 available_base = base_balance_tokens - min_reserve
 
-                logger.info(
+                logger.debug(
                     "[{}] {} balance: {} (available: {} after {} reserve)",
                     self.account_id,
                     base_token,
@@ -365,10 +449,8 @@ class SwapEngine:
                     return None
 
                 # Ensure we still have SOL for fees
-                min_sol_reserve = self.strategy.get("min_sol_reserve", 0.01)
-                sol_balance = await self.solana_client.get_balance(
-                    Pubkey.from_string(str(self.keypair.pubkey()))
-                )
+                min_sol_reserve = self._sol_reserve
+                sol_balance = balances.get("SOL")
                 if sol_balance is not None and (sol_balance / 1e9) < min_sol_reserve:
                     logger.warning(
                         "[{}] SOL balance below fee reserve ({} SOL); skipping BUY",
@@ -377,7 +459,7 @@ class SwapEngine:
                     )
                     return None
 
-                logger.info(
+                logger.debug(
                     "[{}] Using entire {} balance: {}",
                     self.account_id,
                     base_token,
@@ -387,7 +469,7 @@ class SwapEngine:
 
             except Exception as e:
                 logger.error("[{}] Failed to check {} balance: {}", self.account_id, base_token, e)
-                return target_amount
+                return default_size
 
         return None
 
@@ -400,18 +482,36 @@ class SwapEngine:
 
         return True
 
+    def _preflight(self, signal: Signal) -> Optional[str]:
+        """
+        Run the cheap checks that can reject a signal without any RPC.
+
+        Args:
+            signal: Validated trading signal
+
+        Returns:
+            Rejection reason, or None if the signal may proceed
+        """
+        input_token, output_token = self._get_swap_tokens(signal)
+        if not input_token or not output_token:
+            return "could not determine swap tokens"
+
+        # SwapManager rejects tokens without a configured mint; fail before the balance lookup.
+        if self.token_config:
+            for token in (input_token, output_token):
+                if token not in self.token_config:
+                    return f"{token} mint not configured"
+
+        return None
+
     def _check_cooldown(self, symbol: str) -> bool:
         """Check if enough time has passed since last swap."""
-        min_time_between = self.strategy.get("min_time_between_swaps", 30)
+        min_time_between = self._cooldown_s
         if min_time_between <= 0:
             return True
 
         last_swap = self.last_swap_time.get(symbol)
-        if not last_swap:
-            return True
-
-        elapsed = (datetime.utcnow() - last_swap).total_seconds()
-        return elapsed >= min_time_between
+        return last_swap is None or time.monotonic() - last_swap >= min_time_between
 
     def _get_swap_tokens(self, signal: Signal) -> tuple[str, str]:
         """
@@ -423,12 +523,9 @@ class SwapEngine:
         Returns:
             Tuple of (input_token, output_token)
         """
-        base_token = self.strategy.get("base_token", "SOL")
-        quote_token = self.strategy.get("quote_token", "SKR")
-
         if signal.action == "BUY":
             # BUY quote token with base token (SOL → SKR)
-            return base_token, quote_token
+            return self._base_token, self._quote_token
         else:
             # SELL quote token for base token (SKR → SOL)
-            return quote_token, base_token
+            return self._quote_token, self._base_token
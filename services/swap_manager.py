@@ -1,21 +1,78 @@
 """Swap execution manager for Jupiter swaps."""
 import asyncio
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional, Set
 from loguru import logger
 
 from models.schemas import SwapRequest, SwapResult
 from exchange.jupiter_client import JupiterClient
 from exchange.solana_client import SolanaClient
 from services.analytics_store import AnalyticsStore
+from utils.coalesce import Coalescer
 from utils.wallet import to_lamports, format_lamports
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from spl.token.instructions import get_associated_token_address
 
+if TYPE_CHECKING:
+    from services.analytics_writer import AnalyticsWriter
+
+# Base fee per signature; Jupiter swap transactions are signed by the wallet alone.
+_LAMPORTS_PER_SIGNATURE = 5000
+
+_SOL_DECIMALS = 9
+
+
+def _quoted_fee_lamports(swap_tx: Dict[str, Any]) -> Optional[int]:
+    """Network fee implied by Jupiter's swap response, or None when it does not report one."""
+    priority_fee = swap_tx.get("prioritizationFeeLamports")
+    if priority_fee is None:
+        return None
+    try:
+        return _LAMPORTS_PER_SIGNATURE + int(priority_fee)
+    except (TypeError, ValueError):
+        return None
+
+
+def _discard_task_result(task: "asyncio.Task") -> None:
+    """Retrieve an abandoned task's outcome so its exception is not reported as unhandled."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _fee_usd(fee_lamports: int, sol_usd_price: Optional[float]) -> Optional[float]:
+    """USD value of a fee in lamports (fees are paid in SOL)."""
+    if not sol_usd_price:
+        return None
+    return format_lamports(fee_lamports, decimals=_SOL_DECIMALS) * sol_usd_price
+
 
 class SwapManager:
     """Manages swap execution through Jupiter."""
 
+    __slots__ = (
+        "account_id",
+        "account_label",
+        "keypair",
+        "_owner_pubkey",
+        "_owner_str",
+        "jupiter",
+        "solana",
+        "analytics",
+        "recorder",
+        "token_mints",
+        "_mint_strs",
+        "_pubkey_by_mint",
+        "_sol_mint",
+        "config",
+        "_max_attempts",
+        "_retry_delay",
+        "_compute_unit_price",
+        "_fee_account",
+        "_decimals_cache",
+        "_inflight",
+        "_fee_tasks",
+    )
+
     def __init__(
         self,
         account_id: str,
@@ -26,96 +83,170 @@ class SwapManager:
         analytics: AnalyticsStore,
         token_mints: Dict[str, str],
         config: Dict[str, Any],
+        writer: Optional["AnalyticsWriter"] = None,
     ):
         self.account_id = account_id
         self.account_label = account_label
         self.keypair = keypair
+        self._owner_pubkey = keypair.pubkey()
+        self._owner_str = str(self._owner_pubkey)
         self.jupiter = jupiter
         self.solana = solana
         self.analytics = analytics
+        # Swap records go through the background writer when one is provided.
+        self.recorder = writer or analytics
         self.token_mints = token_mints
+        # Case-insensitive symbol -> mint lookup for swap requests
+        self._mint_strs = {symbol.upper(): mint for symbol, mint in token_mints.items()}
+        self._sol_mint = token_mints.get("SOL")
+        # Parsed once; decimals and fee-account lookups take Pubkeys.
+        self._pubkey_by_mint: Dict[str, Pubkey] = {}
+        for symbol, mint in token_mints.items():
+            try:
+                self._pubkey_by_mint[mint] = Pubkey.from_string(mint)
+            except Exception as e:
+                logger.warning("[{}] Invalid {} mint {}: {}", account_id, symbol, mint, e)
         self.config = config
+        # Swap settings resolved once; config does not change at runtime.
+        swap_config = config.get("swap", {})
+        jupiter_config = config.get("jupiter", {})
+        self._max_attempts = swap_config.get("max_attempts", 2)
+        self._retry_delay = swap_config.get("retry_delay_seconds", 1)
+        self._compute_unit_price = jupiter_config.get("compute_unit_price", 100000)
+        self._fee_account = jupiter_config.get("fee_account")
+        # mint -> decimals, resolved once per mint (SOL's are fixed)
+        self._decimals_cache: Dict[str, int] = {}
+        if self._sol_mint:
+            self._decimals_cache[self._sol_mint] = _SOL_DECIMALS
+        # One in-flight swap per identical request; duplicates share its result.
+        self._inflight = Coalescer()
+        # Background fee lookups for completed swaps (held so they are not collected)
+        self._fee_tasks: Set[asyncio.Task] = set()
 
     async def execute_swap(self, request: SwapRequest) -> SwapResult:
         """
         Execute a token swap through Jupiter.
 
+        A request identical to one still running (same direction, amount and
+        slippage) joins that swap instead of sending a second transaction.
+
         Args:
             request: Swap request details
 
         Returns:
             SwapResult with execution details
         """
-        # Get token mints
-        input_mint = self.token_mints.get(request.input_token)
-        output_mint = self.token_mints.get(request.output_token)
+        input_symbol = request.input_token.upper()
+        output_symbol = request.output_token.upper()
+        key = (input_symbol, output_symbol, request.amount, request.slippage_bps)
+        return await self._inflight.run(
+            key,
+            lambda: self._execute_swap(request, input_symbol, output_symbol),
+        )
+
+    async def _execute_swap(self, request: SwapRequest, input_symbol: str, output_symbol: str) -> SwapResult:
+        # Get token mints (symbols are already upper-cased)
+        input_mint = self._mint_strs.get(input_symbol)
+        output_mint = self._mint_strs.get(output_symbol)
 
         if not input_mint or not output_mint:
             error = f"Unknown token: {request.input_token} or {request.output_token}"
             logger.error("[{}] {}", self.account_id, error)
             return SwapResult(success=False, input_amount=request.amount, error=error)
 
-        input_decimals = await self._get_token_decimals(request.input_token, input_mint)
-        output_decimals = await self._get_token_decimals(request.output_token, output_mint)
+        input_decimals, output_decimals = await asyncio.gather(
+            self._get_token_decimals(input_symbol, input_mint),
+            self._get_token_decimals(output_symbol, output_mint),
+        )
 
         # Convert amount to lamports
         input_lamports = to_lamports(request.amount, decimals=input_decimals)
 
-        # Fetch current USD prices for input/output tokens
-        input_token_usd_price = None
-        input_usd = None
-        try:
-            token_mints = [input_mint, output_mint]
-            prices = await self.jupiter.get_token_price(token_mints)
-            if prices:
-                input_token_usd_price = prices.get(input_mint, 0)
-                input_usd = request.amount * input_token_usd_price if input_token_usd_price else None
-        except Exception as e:
-            logger.warning("[{}] Failed to fetch USD prices: {}", self.account_id, e)
-
-        # Create swap record with USD prices
-        swap_id = self.analytics.create_swap(
-            account_id=self.account_id,
-            account_label=self.account_label,
-            input_token=request.input_token,
-            output_token=request.output_token,
-            input_amount=request.amount,
-            meta={"slippage_bps": request.slippage_bps},
-            input_token_usd_price=input_token_usd_price,
-            input_usd=input_usd,
-        )
-
-        max_attempts = self.config.get("swap", {}).get("max_attempts", 2)
-        retry_delay = self.config.get("swap", {}).get("retry_delay_seconds", 1)
+        max_attempts = self._max_attempts
+        retry_delay = self._retry_delay
         last_error = None
 
+        # Start the first quote now so it is in flight while prices are
+        # fetched and the swap record is written.
+        logger.debug("[{}] Fetching Jupiter quote (attempt 1/{})...", self.account_id, max_attempts)
+        first_quote = asyncio.ensure_future(self.jupiter.get_quote(
+            input_mint=input_mint,
+            output_mint=output_mint,
+            amount=input_lamports,
+            slippage_bps=request.slippage_bps,
+        ))
+
+        # The first quote is consumed at the top of the retry loop; if we fail or are
+        # cancelled before reaching it, cancel it rather than leave it orphaned.
+        try:
+            # Fetch USD prices for both sides, plus SOL for the fee, in one call;
+            # they are reused when the swap completes.
+            price_mints = [input_mint, output_mint]
+            sol_mint = self._sol_mint
+            if sol_mint and sol_mint not in price_mints:
+                price_mints.append(sol_mint)
+
+            prices: Dict[str, float] = {}
+            input_token_usd_price = None
+            input_usd = None
+            try:
+                prices = await self.jupiter.get_token_price(price_mints) or {}
+                if prices:
+                    input_token_usd_price = prices.get(input_mint, 0)
+                    input_usd = request.amount * input_token_usd_price if input_token_usd_price else None
+            except Exception as e:
+                logger.warning("[{}] Failed to fetch USD prices: {}", self.account_id, e)
+
+            # Create swap record with USD prices
+            swap_id = self.recorder.create_swap(
+                account_id=self.account_id,
+                account_label=self.account_label,
+                input_token=request.input_token,
+                output_token=request.output_token,
+                input_amount=request.amount,
+                meta={"slippage_bps": request.slippage_bps},
+                input_token_usd_price=input_token_usd_price,
+                input_usd=input_usd,
+            )
+        except BaseException:
+            first_quote.cancel()
+            first_quote.add_done_callback(_discard_task_result)
+            raise
+
         for attempt in range(1, max_attempts + 1):
             try:
-                # Get quote from Jupiter
-                logger.debug("[{}] Fetching Jupiter quote (attempt {}/{})...", self.account_id, attempt, max_attempts)
-                quote = await self.jupiter.get_quote(
-                    input_mint=input_mint,
-                    output_mint=output_mint,
-                    amount=input_lamports,
-                    slippage_bps=request.slippage_bps,
-                )
+                # Get quote from Jupiter (the first one was started above)
+                if first_quote is not None:
+                    quote_task, first_quote = first_quote, None
+                    quote = await quote_task
+                else:
+                    logger.debug("[{}] Fetching Jupiter quote (attempt {}/{})...", self.account_id, attempt, max_attempts)
+                    quote = await self.jupiter.get_quote(
+                        input_mint=input_mint,
+                        output_mint=output_mint,
+                        amount=input_lamports,
+                        slippage_bps=request.slippage_bps,
+                    )
 
                 if not quote:
                     raise Exception("Failed to get quote from Jupiter")
 
+                # Unpack the quote before anything is sent; a malformed quote
+                # fails this attempt rather than a completed swap.
+                output_lamports = int(quote["outAmount"])
+                price_impact = float(quote.get("priceImpactPct", 0) or 0)
+
                 # Get swap transaction
                 logger.debug("[{}] Getting swap transaction...", self.account_id)
-                compute_unit_price = self.config.get("jupiter", {}).get("compute_unit_price", 100000)
 
                 fee_account = None
                 if quote.get("platformFee"):
-                    fee_account = self.config.get("jupiter", {}).get("fee_account")
+                    fee_account = self._fee_account
                     if not fee_account:
                         try:
-                            owner = Pubkey.from_string(str(self.keypair.pubkey()))
-                            mint = Pubkey.from_string(output_mint)
-                            fee_account = str(get_associated_token_address(owner, mint))
-                            logger.info(
+                            mint = self._pubkey_by_mint.get(output_mint) or Pubkey.from_string(output_mint)
+                            fee_account = str(get_associated_token_address(self._owner_pubkey, mint))
+                            logger.debug(
                                 "[{}] Using derived fee account {} for platform fee",
                                 self.account_id,
                                 fee_account,
@@ -129,8 +260,8 @@ class SwapManager:
 
                 swap_tx = await self.jupiter.get_swap_transaction(
                     quote=quote,
-                    user_public_key=str(self.keypair.pubkey()),
-                    compute_unit_price_micro_lamports=compute_unit_price,
+                    user_public_key=self._owner_str,
+                    compute_unit_price_micro_lamports=self._compute_unit_price,
                     fee_account=fee_account,
                 )
 
@@ -153,59 +284,42 @@ class SwapManager:
                 if not confirmed:
                     logger.warning("[{}] Transaction sent but confirmation failed: {}", self.account_id, signature)
 
-                # Fetch transaction fee (lamports)
-                fee_lamports = await self.solana.get_transaction_fee(signature)
-                fee_usd = None
-
                 # Calculate output amount and price
-                output_lamports = int(quote.get("outAmount", 0))
                 output_amount = format_lamports(output_lamports, decimals=output_decimals)
                 price = output_amount / request.amount if request.amount > 0 else 0
 
-                # Fetch output token USD price
+                # Output token USD price (from the pre-swap lookup)
                 output_token_usd_price = None
                 output_usd = None
-                try:
-                    prices = await self.jupiter.get_token_price([output_mint])
-                    if prices:
-                        output_token_usd_price = prices.get(output_mint, 0)
-                        output_usd = output_amount * output_token_usd_price if output_token_usd_price else None
-                except Exception as e:
-                    logger.warning("[{}] Failed to fetch output USD price: {}", self.account_id, e)
-
-                # Calculate fee USD if possible (fees are in SOL)
-                if fee_lamports is not None:
-                    fee_sol = format_lamports(fee_lamports, decimals=9)
-                    sol_usd_price = None
-                    if request.input_token.upper() == "SOL":
-                        sol_usd_price = input_token_usd_price
-                    elif request.output_token.upper() == "SOL":
-                        sol_usd_price = output_token_usd_price
-                    else:
-                        try:
-                            sol_mint = self.token_mints.get("SOL")
-                            if sol_mint:
-                                sol_prices = await self.jupiter.get_token_price([sol_mint])
-                                if sol_prices:
-                                    sol_usd_price = sol_prices.get(sol_mint, 0)
-                        except Exception as e:
-                            logger.warning("[{}] Failed to fetch SOL USD price for fees: {}", self.account_id, e)
-                    if sol_usd_price:
-                        fee_usd = fee_sol * sol_usd_price
+                if prices:
+                    output_token_usd_price = prices.get(output_mint, 0)
+                    output_usd = output_amount * output_token_usd_price if output_token_usd_price else None
+
+                # Network fee: for a confirmed swap, taken from the priority fee Jupiter reports.
+                # Unconfirmed sends may never have been charged, so those are looked up on chain.
+                sol_usd_price = prices.get(sol_mint) if sol_mint else None
+                fee_lamports = _quoted_fee_lamports(swap_tx) if confirmed else None
+                fee_usd = _fee_usd(fee_lamports, sol_usd_price) if fee_lamports is not None else None
 
                 # Mark swap as completed with USD prices
-                self.analytics.complete_swap(
+                self.recorder.complete_swap(
                     swap_id=swap_id,
                     signature=signature,
                     output_amount=output_amount,
                     price=price,
-                    slippage=float(quote.get("priceImpactPct", 0)),
+                    slippage=price_impact,
                     output_token_usd_price=output_token_usd_price,
                     output_usd=output_usd,
                     fee_lamports=fee_lamports,
                     fee_usd=fee_usd,
                 )
 
+                if fee_lamports is None:
+                    # The fee is reporting data only; look it up after returning.
+                    fee_task = asyncio.create_task(self._record_fee(swap_id, signature, sol_usd_price))
+                    self._fee_tasks.add(fee_task)
+                    fee_task.add_done_callback(self._fee_tasks.discard)
+
                 logger.info(
                     "[{}] Swap completed: {} {} → {} {} (price: {:.6f})",
                     self.account_id,
@@ -222,7 +336,7 @@ class SwapManager:
                     input_amount=request.amount,
                     output_amount=output_amount,
                     price=price,
-                    slippage=float(quote.get("priceImpactPct", 0)),
+                    slippage=price_impact,
                 )
 
             except Exception as e:
@@ -240,7 +354,7 @@ class SwapManager:
 
         # Mark swap as failed
         error_msg = last_error or "Swap failed"
-        self.analytics.fail_swap(swap_id, error_msg)
+        self.recorder.fail_swap(swap_id, error_msg)
 
         return SwapResult(
             success=False,
@@ -248,14 +362,47 @@ class SwapManager:
             error=error_msg,
         )
 
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Wait briefly for background fee lookups to finish, then cancel the rest."""
+        tasks = list(self._fee_tasks)
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("[{}] Cancelled {} unfinished fee lookup(s)", self.account_id, len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _record_fee(self, swap_id: int, signature: str, sol_usd_price: Optional[float]) -> None:
+        """Fetch a completed swap's fee and store it with its USD value (fees are in SOL)."""
+        try:
+            fee_lamports = await self.solana.get_transaction_fee(signature)
+            if fee_lamports is None:
+                return
+            self.recorder.update_swap_fee(
+                swap_id=swap_id,
+                fee_lamports=fee_lamports,
+                fee_usd=_fee_usd(fee_lamports, sol_usd_price),
+            )
+        except Exception as e:
+            logger.warning("[{}] Failed to record fee for swap {}: {}", self.account_id, swap_id, e)
+
     async def _get_token_decimals(self, symbol: str, mint: str) -> int:
-        """Resolve token decimals with SOL + fallback handling."""
-        if symbol.upper() == "SOL":
-            return 9
+        """Resolve token decimals with SOL + fallback handling (symbol is upper-case)."""
+        cached = self._decimals_cache.get(mint)
+        if cached is not None:
+            return cached
+
+        if symbol == "SOL":
+            return _SOL_DECIMALS
 
         try:
-            decimals = await self.solana.get_token_decimals(Pubkey.from_string(mint))
+            mint_pubkey = self._pubkey_by_mint.get(mint) or Pubkey.from_string(mint)
+            decimals = await self.solana.get_token_decimals(mint_pubkey)
             if decimals is not None:
+                # Only real lookups are cached; the fallback below is retried next swap.
+                self._decimals_cache[mint] = int(decimals)
                 return int(decimals)
         except Exception as e:
             logger.warning("[{}] Failed to get decimals for {}: {}", self.account_id, symbol, e)
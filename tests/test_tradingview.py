@@ -0,0 +1,32 @@
+"""Tests for TradingView signal-name parsing."""
+import time
+
+import pytest
+
+from webhooks.tradingview import parse_signal_name
+
+
+def test_parse_signal_name_trims_fields():
+    parsed = parse_signal_name(" SKR , 1m ,Gregus, MR-Low , buy ,2026-01-31T12:00:00Z, 0.0321 ,extra")
+
+    assert parsed.symbol == "SKR"
+    assert parsed.timeframe == "1m"
+    assert parsed.signal_type == "MR-Low"
+    assert parsed.action == "BUY"
+    assert parsed.signal_time == "2026-01-31T12:00:00Z"
+    assert parsed.price == "0.0321"
+
+
+def test_parse_signal_name_rejects_short_names():
+    with pytest.raises(ValueError):
+        parse_signal_name("SKR,1m,Gregus,MR-Low,BUY")
+
+
+def test_parse_signal_name_long_whitespace_field_is_fast():
+    # A pattern that can split whitespace several ways backtracks for seconds here.
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        parse_signal_name("x," + " " * 20000 + "y")
+    parsed = parse_signal_name("SKR,1m,Gregus," + " " * 20000 + ",BUY,t,1")
+    assert time.perf_counter() - start < 0.5
+    assert parsed.signal_type == ""
@@ -0,0 +1,29 @@
+"""Single-flight coalescing for concurrent async calls."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class Coalescer:
+    """Share one in-flight call among concurrent callers using the same key."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await factory() for key, joining an in-flight call if one exists.
+
+        Args:
+            key: Identifies calls that may share a result
+            factory: Starts the underlying call; only invoked by the first caller
+
+        Returns:
+            The shared result (exceptions propagate to every caller)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the shared call.
+        return await asyncio.shield(task)
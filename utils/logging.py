@@ -1,11 +1,26 @@
 """Logging configuration for SKR Swap bot."""
 import sys
 from pathlib import Path
+from typing import Optional
 from loguru import logger
 
 
-def setup_logging(log_dir: str = "./logs", level: str = "INFO") -> None:
-    """Configure loguru logging with file and console output."""
+def setup_logging(
+    log_dir: str = "./logs",
+    level: str = "INFO",
+    console_level: Optional[str] = None,
+) -> None:
+    """
+    Configure loguru logging with file and console output.
+
+    Sinks are written from loguru's background queue so logging never blocks
+    the event loop; call ``await logger.complete()`` on shutdown to flush.
+
+    Args:
+        log_dir: Directory for the rotating log file
+        level: Minimum level written to the log file
+        console_level: Minimum level printed to stdout (defaults to level)
+    """
     # Remove default handler
     logger.remove()
 
@@ -13,8 +28,12 @@ def setup_logging(log_dir: str = "./logs", level: str = "INFO") -> None:
     logger.add(
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level=level,
-        colorize=True,
+        level=console_level or level,
+        # Skip ANSI colour codes when stdout is piped or captured
+        colorize=sys.stdout.isatty(),
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
 
     # File handler
@@ -27,6 +46,9 @@ def setup_logging(log_dir: str = "./logs", level: str = "INFO") -> None:
         rotation="100 MB",
         retention="30 days",
         compression="zip",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
 
     logger.info(f"Logging configured at {level} level")
@@ -0,0 +1,47 @@
+"""Sparkline geometry for dashboard price charts."""
+from typing import Any, Dict, List, Sequence
+
+
+def sparkline_segments(
+    prices: Sequence[float],
+    width: float = 220,
+    height: float = 86,
+) -> List[Dict[str, Any]]:
+    """
+    Split a price series into polyline segments above/below its mean.
+
+    Args:
+        prices: Price values in chronological order
+        width: SVG viewBox width
+        height: SVG viewBox height
+
+    Returns:
+        List of {"above": bool, "points": "x,y x,y ..."} segments; each new
+        segment repeats the previous point so the line stays continuous.
+    """
+    count = len(prices)
+    if count < 2:
+        return []
+
+    low = min(prices)
+    high = max(prices)
+    mean = sum(prices) / count
+    scale = height / ((high - low) or 1)
+    step = (width - 4) / (count - 1)
+
+    coords = [
+        f"{i * step + 2:.2f},{height - (price - low) * scale:.2f}"
+        for i, price in enumerate(prices)
+    ]
+
+    segments: List[Dict[str, Any]] = []
+    current_above = prices[0] >= mean
+    start = 0
+    for i in range(1, count):
+        above = prices[i] >= mean
+        if above != current_above:
+            segments.append({"above": current_above, "points": " ".join(coords[start:i])})
+            start = i - 1
+            current_above = above
+    segments.append({"above": current_above, "points": " ".join(coords[start:])})
+    return segments
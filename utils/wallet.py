@@ -1,9 +1,17 @@
 """Wallet utilities for Solana."""
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Union
 import base58
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 
+# Powers of ten for every realistic token decimals value (SOL is 9, most SPL tokens <= 9).
+_POW10 = tuple(10 ** i for i in range(19))
+
+
+def _pow10(decimals: int) -> int:
+    return _POW10[decimals] if 0 <= decimals < len(_POW10) else 10 ** decimals
+
 
 def load_keypair_from_base58(private_key: str) -> Optional[Keypair]:
     """
@@ -56,10 +64,10 @@ def format_lamports(lamports: int, decimals: int = 9) -> float:
     Returns:
         Decimal amount as float
     """
-    return lamports / (10 ** decimals)
+    return lamports / _pow10(decimals)
 
 
-def to_lamports(amount: float, decimals: int = 9) -> int:
+def to_lamports(amount: Union[float, str, Decimal], decimals: int = 9) -> int:
     """
     Convert decimal amount to lamports.
 
@@ -68,6 +76,7 @@ def to_lamports(amount: float, decimals: int = 9) -> int:
         decimals: Token decimals
 
     Returns:
-        Amount in base units (lamports)
+        Amount in base units (lamports), truncated toward zero
     """
-    return int(amount * (10 ** decimals))
+    # Go through the shortest decimal repr so 0.1 becomes 100000 at 6 decimals, not 99999.
+    return int(Decimal(str(amount)) * _pow10(decimals))
@@ -1,4 +1,7 @@
 """TradingView webhook handler for SKR Swap."""
+import re
+import orjson
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Request, HTTPException, status
 from loguru import logger
@@ -8,30 +11,50 @@ from models.schemas import Signal
 
 router = APIRouter()
 
-def parse_signal_name(signal_name: str) -> Dict[str, Any]:
+# First seven comma-separated fields, whitespace-trimmed; anything after the seventh is ignored.
+# A field's value starts and ends on a non-space character, so surrounding whitespace has only
+# one way to match and the pattern runs in linear time on any input.
+_SIGNAL_FIELD = r"\s*(?:([^,\s](?:[^,]*[^,\s])?)\s*)?"
+_SIGNAL_RE = re.compile(",".join([_SIGNAL_FIELD] * 7) + r"(?:,|$)")
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedSignal:
+    """Fields of a signal name; action is upper-cased, the rest are as sent."""
+    action: str
+    signal_type: str
+    timeframe: str
+    symbol: str
+    signal_time: str
+    price: str
+    signal_source: str
+
+
+def parse_signal_name(signal_name: str) -> ParsedSignal:
     """
     Parse signal name format: SYMBOL,TIMEFRAME,Gregus,TYPE,ACTION,SIGNALTIME,PRICE
     Example: SKR,1m,Gregus,MR-Low,BUY,2026-01-31T12:00:00Z,0.0321
     """
-    parts = [p.strip() for p in signal_name.split(",")]
-    if len(parts) < 7:
+    match = _SIGNAL_RE.match(signal_name)
+    if match is None:
         raise ValueError(
             "Signal name must have 7 parts: SYMBOL,TIMEFRAME,Gregus,TYPE,ACTION,SIGNALTIME,PRICE"
         )
 
-    symbol, timeframe, source, signal_type, action, signal_time, price = parts[:7]
+    # Empty fields leave their group unset
+    symbol, timeframe, source, signal_type, action, signal_time, price = match.groups("")
     if source != "Gregus":
         raise ValueError("Signal source must be 'Gregus'")
 
-    return {
-        "action": action.upper(),
-        "signal_type": signal_type,
-        "timeframe": timeframe,
-        "symbol": symbol,
-        "signal_time": signal_time,
-        "price": price,
-        "signal_source": source,
-    }
+    return ParsedSignal(
+        action=action.upper(),
+        signal_type=signal_type,
+        timeframe=timeframe,
+        symbol=symbol,
+        signal_time=signal_time,
+        price=price,
+        signal_source=source,
+    )
 
 
 def parse_webhook_payload(body: bytes, content_type: Optional[str]) -> Dict[str, Any]:
@@ -44,44 +67,38 @@ def parse_webhook_payload(body: bytes, content_type: Optional[str]) -> Dict[str,
     - CSV format: signal=SKR,1m,Gregus,MR-Low,BUY,2026-01-31T12:00:00Z,0.0321
     """
     try:
-        # Try JSON first
-        if content_type and "application/json" in content_type:
-            import json
-            return json.loads(body.decode("utf-8"))
-
-        # Try CSV format
-        text = body.decode("utf-8").strip()
-        if "=" in text and "," in text:
-            tokens = [p.strip() for p in text.split(",")]
+        # JSON by content type or by its opening byte
+        text = body.strip()
+        if (content_type and "application/json" in content_type) or text[:1] == b"{":
+            return orjson.loads(text)
+
+        # CSV format; split as bytes and decode only the keys and values kept
+        if b"=" in text:
+            tokens = [p.strip() for p in text.split(b",")]
             result: Dict[str, Any] = {}
             idx = 0
             while idx < len(tokens):
                 token = tokens[idx]
-                if "=" not in token:
+                if b"=" not in token:
                     idx += 1
                     continue
-                key, value = token.split("=", 1)
+                key, value = token.split(b"=", 1)
                 key = key.strip()
                 value = value.strip()
-                if key == "signal":
+                if key == b"signal":
                     signal_parts = [value]
                     idx += 1
-                    while idx < len(tokens) and "=" not in tokens[idx]:
+                    while idx < len(tokens) and b"=" not in tokens[idx]:
                         signal_parts.append(tokens[idx])
                         idx += 1
-                    result["signal"] = ",".join(signal_parts)
+                    result["signal"] = b",".join(signal_parts).decode("utf-8")
                     continue
-                result[key] = value
+                result[key.decode("utf-8")] = value.decode("utf-8")
                 idx += 1
             return result
 
         # Raw signal string (no key=value pairs)
-        if "," in text:
-            return {"signal": text}
-
-        # Default: try as JSON
-        import json
-        return json.loads(text)
+        return {"signal": text.decode("utf-8")}
 
     except Exception as e:
         logger.error("Failed to parse webhook payload: {}", e)
@@ -129,17 +146,17 @@ async def webhook(request: Request) -> Dict[str, Any]:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid signal name: {e}"
         )
-    action = parsed["action"]
-    symbol = parsed["symbol"]
+    action = parsed.action
+    symbol = parsed.symbol
     signal_meta.update({
-        "signal_type": parsed["signal_type"],
-        "timeframe": parsed["timeframe"],
-        "signal_time": parsed["signal_time"],
-        "signal_source": parsed["signal_source"],
+        "signal_type": parsed.signal_type,
+        "timeframe": parsed.timeframe,
+        "signal_time": parsed.signal_time,
+        "signal_source": parsed.signal_source,
     })
 
-    if "price" not in payload and parsed.get("price") is not None:
-        payload["price"] = parsed["price"]
+    if "price" not in payload:
+        payload["price"] = parsed.price
 
     # Validate required fields
     if action not in ("BUY", "SELL"):